@@ -3,37 +3,54 @@ CopilotTaskMaster - Markdown task card management with MCP integration
 """
 
 import os
-from importlib.metadata import PackageNotFoundError, version as _version
+import sys
+from importlib import import_module
+from importlib.metadata import PackageNotFoundError, version as _dist_version
 
 # Resolve package version with a simple precedence:
 # 1) TASKMASTER_VERSION env var (CI / Docker build-arg)
-# 2) setuptools_scm-generated file `taskmaster/_version.py` (if present)
+# 2) setuptools_scm-generated module `taskmaster/_version.py` (if present)
 # 3) installed package metadata (importlib.metadata)
 # 4) fallback to "0.0.0"
 
-v = os.environ.get("TASKMASTER_VERSION")
-if v:
-    __version__ = v
-else:
-    # Prefer the file written by setuptools_scm at build time
-    ver_file = os.path.join(os.path.dirname(__file__), "_version.py")
-    if os.path.exists(ver_file):
-        try:
-            data = {}
-            with open(ver_file, "r", encoding="utf-8") as f:
-                exec(f.read(), data)
-            __version__ = data.get("version") or data.get("__version__")
-            if not __version__:
-                raise ValueError("no version in _version.py")
-        except Exception:
-            __version__ = "0.0.0"
-    else:
-        try:
-            __version__ = _version("CopilotTaskMaster")
-        except PackageNotFoundError:
-            __version__ = "0.0.0"
-
-from .task_manager import TaskManager
-from .search import TaskSearcher
+
+def _resolve_version() -> str:
+    v = os.environ.get("TASKMASTER_VERSION")
+    if v:
+        return v
+
+    # Import the setuptools_scm file as a regular module so its bytecode is cached
+    # in __pycache__ instead of being re-read and compiled on every start. Drop any
+    # previously imported copy so importlib.reload(taskmaster) sees a rewritten file.
+    name = f"{__name__}._version"
+    sys.modules.pop(name, None)
+    try:
+        scm = import_module(name)
+    except ImportError:
+        scm = None
+    except Exception:
+        return "0.0.0"
+    if scm is not None:
+        return getattr(scm, "version", None) or getattr(scm, "__version__", None) or "0.0.0"
+
+    try:
+        return _dist_version("CopilotTaskMaster")
+    except PackageNotFoundError:
+        return "0.0.0"
+
+
+__version__ = _resolve_version()
 
 __all__ = ["TaskManager", "TaskSearcher", "__version__"]
+
+
+def __getattr__(name):
+    # Import the heavy modules on first use so `taskmaster --version` and other
+    # CLI paths don't pay for frontmatter/yaml unless they need them.
+    if name == "TaskManager":
+        from .task_manager import TaskManager
+        return TaskManager
+    if name == "TaskSearcher":
+        from .search import TaskSearcher
+        return TaskSearcher
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,181 @@
+"""
+Frontmatter Cache - Parsed task files shared by TaskManager and TaskSearcher
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple, Union
+import frontmatter
+import yaml
+
+# Same loader python-frontmatter's YAMLHandler uses: libyaml's when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Stateless, so one instance serves every parsed and newly created Post
+_YAML_HANDLER = frontmatter.YAMLHandler()
+
+# Delimiter line of a YAML frontmatter block (`---`, or more dashes)
+_FM_BOUNDARY = _YAML_HANDLER.FM_BOUNDARY
+
+
+def _parse_post(text: str) -> frontmatter.Post:
+    """`frontmatter.loads` with the shared YAML handler when the text starts with `---`.
+
+    Other formats (JSON frontmatter, plain markdown) still go through format detection.
+    """
+    if _YAML_HANDLER.detect(text.lstrip()):
+        return frontmatter.loads(text, handler=_YAML_HANDLER)
+    return frontmatter.loads(text)
+
+
+def _load_post(md_file: Union[str, Path], body_chars: Optional[int] = None) -> frontmatter.Post:
+    """Load a task file, reading at most `body_chars` characters of its body.
+
+    With `body_chars=None` the whole file is parsed. Otherwise only the frontmatter
+    block plus the start of the body is read, which keeps previews cheap for large tasks.
+    A header-only read (`body_chars=0`) of a block whose first line is exactly `---` hands
+    the block straight to the YAML loader, skipping frontmatter's format detection and
+    splitting. Files that do not open with such a closed block (JSON frontmatter, leading
+    blank lines) are parsed in full and then truncated.
+    """
+    with open(md_file, 'r', encoding='utf-8') as f:
+        if body_chars is None:
+            return _parse_post(f.read())
+
+        first = f.readline()
+        head = [first]
+        closed = False
+        if first.rstrip('\r\n') == '---':
+            # Close the block where frontmatter's own split would
+            for line in f:
+                head.append(line)
+                if _FM_BOUNDARY.match(line):
+                    closed = True
+                    break
+        if not closed:
+            # No header to stop at: the partial read could not split the file correctly
+            head.append(f.read())
+        elif body_chars == 0:
+            metadata = yaml.load(''.join(head[1:-1]), Loader=_YAML_LOADER)
+            if isinstance(metadata, dict):
+                post = frontmatter.Post('', handler=_YAML_HANDLER)
+                post.metadata.update(metadata)
+                return post
+            head.append(f.read(1))
+        else:
+            head.append(f.read(body_chars + 1))
+
+    post = _parse_post(''.join(head))
+    post.content = post.content[:body_chars]
+    return post
+
+
+class FrontmatterCache:
+    """LRU cache of parsed task files, validated against each file's (mtime_ns, size)
+
+    Any edit - through TaskManager or by hand - changes the stat data, so stale entries
+    are re-read on the next access. Safe to share between threads. `hits` and `misses`
+    count lookups since creation or the last `clear`.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        """
+        Initialize FrontmatterCache
+
+        Args:
+            max_entries: Number of parsed files to keep before evicting the least recently used
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, md_file: Union[str, Path], header_only: bool = False, st: Optional[os.stat_result] = None) -> frontmatter.Post:
+        """Load a task file through the cache.
+
+        With `header_only=True` only the frontmatter block is read and the returned Post has
+        an empty body; use it when just the metadata is needed. A cached full parse serves
+        both kinds of request. The returned Post is shared between callers and must not be
+        modified. Directory walks can pass `os.DirEntry.path` as a plain string and the
+        `os.DirEntry.stat()` result as `st` (free on Windows, where the listing carries it)
+        instead of a fresh `os.stat`.
+        """
+        if st is None:
+            st = os.stat(md_file)
+        key = str(md_file)
+        with self._lock:
+            hit = self._entries.get(key)
+            if (hit is not None and hit[0] == st.st_mtime_ns and hit[1] == st.st_size
+                    and (hit[3] or header_only)):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return hit[2]
+            self.misses += 1
+
+        post = _load_post(md_file, 0 if header_only else None)
+        with self._lock:
+            self._entries[key] = (st.st_mtime_ns, st.st_size, post, not header_only)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return post
+
+    def get_lowered(self, md_file: Path) -> Tuple[frontmatter.Post, str]:
+        """Full parse of a task file together with its lowercased body.
+
+        The lowercase copy is computed once per cached parse and kept with it, so repeated
+        text searches over unchanged files skip `str.lower()` on every body.
+        """
+        post = self.get(md_file)
+        key = str(md_file)
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit is not None and hit[2] is post and len(hit) > 4:
+                return post, hit[4]
+
+        lowered = post.content.lower()
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit is not None and hit[2] is post:
+                self._entries[key] = hit[:4] + (lowered,)
+        return post, lowered
+
+    def put(self, md_file: Path, post: frontmatter.Post) -> None:
+        """Record `post` as the current full parse of `md_file`, e.g. right after writing it.
+
+        The caller hands ownership of `post` to the cache and must not modify it afterwards.
+        """
+        st = os.stat(md_file)
+        key = str(md_file)
+        with self._lock:
+            self._entries[key] = (st.st_mtime_ns, st.st_size, post, True)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, md_file: Path) -> None:
+        """Forget a file, e.g. after deleting it"""
+        with self._lock:
+            self._entries.pop(str(md_file), None)
+
+    def rename(self, old_file: Path, new_file: Path) -> None:
+        """Move a cached parse to a file's new path; moves keep mtime and size, so the
+        entry stays valid"""
+        with self._lock:
+            hit = self._entries.pop(str(old_file), None)
+            if hit is not None:
+                self._entries[str(new_file)] = hit
+
+    def clear(self) -> None:
+        """Drop every cached entry"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Process-wide cache used by managers and searchers constructed without an explicit one
+default_cache = FrontmatterCache()
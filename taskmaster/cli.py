@@ -4,12 +4,60 @@ CLI - Command-line interface for TaskMaster
 
 import os
 import sys
-import json
-from pathlib import Path
+import functools
 import click
 from . import __version__
-from .task_manager import TaskManager
-from .search import TaskSearcher
+from .utils import ProjectResolutionError, project_resolution_error_msg
+
+# Tree-drawing glyphs indexed by "is last child"
+_CONNECTORS = ("├── ", "└── ")
+_EXTENSIONS = ("│   ", "    ")
+
+
+def _make_manager(tasks_dir):
+    from .task_manager import TaskManager
+    return TaskManager(tasks_dir)
+
+
+def _make_searcher(tasks_dir):
+    from .search import TaskSearcher
+    return TaskSearcher(tasks_dir)
+
+
+class _LazyObj(dict):
+    """Context object that builds the manager/searcher on first access.
+
+    Commands only pay for the component they actually use, including the import
+    of its module (and of frontmatter/yaml behind it).
+    """
+
+    _factories = {
+        'manager': _make_manager,
+        'searcher': _make_searcher,
+    }
+
+    def __missing__(self, key):
+        factory = self._factories.get(key)
+        if factory is None:
+            raise KeyError(key)
+        value = self[key] = factory(self['tasks_dir'])
+        return value
+
+
+def handle_project_errors(func):
+    """Report project resolution failures uniformly and exit with status 2.
+
+    Only `ProjectResolutionError` is caught; any other error raised by the command
+    propagates unchanged instead of being reported as a missing project.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        except ProjectResolutionError as e:
+            click.echo(project_resolution_error_msg(e), err=True)
+            sys.exit(2)
+    return wrapper
 
 
 @click.group()
@@ -18,14 +66,12 @@ from .search import TaskSearcher
 @click.pass_context
 def main(ctx, tasks_dir):
     """CopilotTaskMaster - Manage markdown task cards"""
-    ctx.ensure_object(dict)
+    ctx.obj = _LazyObj(ctx.obj or {})
     
     if tasks_dir is None:
         tasks_dir = os.environ.get('TASKMASTER_TASKS_DIR', './tasks')
     
     ctx.obj['tasks_dir'] = tasks_dir
-    ctx.obj['manager'] = TaskManager(tasks_dir)
-    ctx.obj['searcher'] = TaskSearcher(tasks_dir)
 
 
 @main.command()
@@ -37,6 +83,7 @@ def main(ctx, tasks_dir):
 @click.option('--tags', multiple=True, help='Task tags')
 @click.option('--project', default=None, help='Project name to scope operation')
 @click.pass_context
+@handle_project_errors
 def create(ctx, path, title, content, status, priority, tags, project):
     """Create a new task card"""
     manager = ctx.obj['manager']
@@ -49,13 +96,7 @@ def create(ctx, path, title, content, status, priority, tags, project):
     if tags:
         metadata['tags'] = list(tags)
 
-    from .utils import project_resolution_error_msg
-
-    try:
-        result = manager.create_task(path, title, content, metadata, project=project)
-    except ValueError as e:
-        click.echo(project_resolution_error_msg(e), err=True)
-        sys.exit(2)
+    result = manager.create_task(path, title, content, metadata, project=project)
 
     click.echo(f"✓ Created task: {result['path']}")
     click.echo(f"  Title: {result['title']}")
@@ -67,17 +108,12 @@ def create(ctx, path, title, content, status, priority, tags, project):
 @click.option('--full', is_flag=True, help='Show full content')
 @click.option('--project', default=None, help='Project name to scope operation')
 @click.pass_context
+@handle_project_errors
 def show(ctx, path, full, project):
     """Show a task card"""
     manager = ctx.obj['manager']
     
-    from .utils import project_resolution_error_msg
-
-    try:
-        task = manager.read_task(path, project=project)
-    except ValueError as e:
-        click.echo(project_resolution_error_msg(e), err=True)
-        sys.exit(2)
+    task = manager.read_task(path, project=project)
 
     if not task:
         click.echo(f"✗ Task not found: {path}", err=True)
@@ -102,6 +138,7 @@ def show(ctx, path, full, project):
 @click.option('--add-tag', multiple=True, help='Add tags')
 @click.option('--project', default=None, help='Project name to scope operation')
 @click.pass_context
+@handle_project_errors
 def update(ctx, path, title, content, status, priority, add_tag, project):
     """Update a task card"""
     manager = ctx.obj['manager']
@@ -112,22 +149,8 @@ def update(ctx, path, title, content, status, priority, add_tag, project):
     if priority:
         metadata['priority'] = priority
     
-    from .utils import project_resolution_error_msg
-
-    try:
-        if add_tag:
-            # Read existing tags first
-            task = manager.read_task(path, project=project)
-            if task:
-                existing_tags = task['metadata'].get('tags', [])
-                if isinstance(existing_tags, str):
-                    existing_tags = [existing_tags]
-                metadata['tags'] = list(set(existing_tags + list(add_tag)))
-
-        result = manager.update_task(path, title, content, metadata, project=project)
-    except ValueError as e:
-        click.echo(project_resolution_error_msg(e), err=True)
-        sys.exit(2)
+    # Tags are merged inside update_task so the file is only parsed once
+    result = manager.update_task(path, title, content, metadata, project=project, add_tags=add_tag)
 
     if not result:
         click.echo(f"✗ Task not found: {path}", err=True)
@@ -140,17 +163,12 @@ def update(ctx, path, title, content, status, priority, add_tag, project):
 @click.argument('path')
 @click.option('--project', default=None, help='Project name to scope operation')
 @click.pass_context
+@handle_project_errors
 def delete(ctx, path, project):
     """Delete a task card"""
     manager = ctx.obj['manager']
     
-    from .utils import project_resolution_error_msg
-
-    try:
-        success = manager.delete_task(path, project=project)
-    except ValueError as e:
-        click.echo(project_resolution_error_msg(e), err=True)
-        sys.exit(2)
+    success = manager.delete_task(path, project=project)
 
     if success:
         click.echo(f"✓ Deleted task: {path}")
@@ -159,73 +177,86 @@ def delete(ctx, path, project):
         sys.exit(1)
 
 
-@main.command()
+@main.command(name="list")
 @click.option('--subpath', default="", help='Subdirectory to list')
 @click.option('--recursive/--no-recursive', default=True, help='Include subdirectories')
 @click.option('--full', is_flag=True, help='Show full content')
 @click.option('--project', default=None, help='Project name to scope operation')
 @click.pass_context
-def list(ctx, subpath, recursive, full, project):
+@handle_project_errors
+def list_cmd(ctx, subpath, recursive, full, project):
     """List all tasks"""
     manager = ctx.obj['manager']
     
-    from .utils import project_resolution_error_msg
-
-    try:
-        tasks = manager.list_tasks(subpath=subpath, recursive=recursive, include_content=full, project=project)
-    except ValueError as e:
-        click.echo(project_resolution_error_msg(e), err=True)
-        sys.exit(2)
+    if full:
+        tasks = manager.list_tasks(
+            subpath=subpath,
+            recursive=recursive,
+            include_content=True,
+            project=project,
+            preview_chars=100
+        )
+    else:
+        # Compact TaskSummary records carry everything the plain listing prints
+        tasks = manager.list_task_summaries(subpath=subpath, recursive=recursive, project=project)
     
     if not tasks:
         click.echo("No tasks found.")
         return
     
-    click.echo(f"Found {len(tasks)} task(s):\n")
+    # Buffer the whole listing and write it once instead of echoing line by line
+    out = [f"Found {len(tasks)} task(s):\n\n"]
     for task in tasks:
-        click.echo(f"• {task['path']}")
-        click.echo(f"  {task['title']}")
-        
-        if 'status' in task['metadata']:
-            click.echo(f"  Status: {task['metadata']['status']}")
-        
-        if full and 'content' in task:
-            click.echo(f"  Content: {task['content'][:100]}...")
+        if full:
+            out.append(f"• {task['path']}\n  {task['title']}\n")
+            
+            if 'status' in task['metadata']:
+                out.append(f"  Status: {task['metadata']['status']}\n")
+            
+            if 'content' in task:
+                out.append(f"  Content: {task['content'][:100]}...\n")
+        else:
+            out.append(f"• {task.path}\n  {task.title}\n")
+            
+            if task.status is not None:
+                out.append(f"  Status: {task.status}\n")
         
-        click.echo()
+        out.append("\n")
+    
+    click.echo("".join(out), nl=False)
 
 
 @main.command()
 @click.option('--subpath', default="", help='Subdirectory to show structure for')
 @click.option('--project', default=None, help='Project name to scope operation')
 @click.pass_context
+@handle_project_errors
 def tree(ctx, subpath, project):
     """Show hierarchical structure of tasks"""
     manager = ctx.obj['manager']
     
-    from .utils import project_resolution_error_msg
-
-    try:
-        structure = manager.get_structure(subpath, project=project)
-    except ValueError as e:
-        click.echo(project_resolution_error_msg(e), err=True)
-        sys.exit(2)
+    structure = manager.get_structure(subpath, project=project)
     
-    def print_tree(node, prefix="", is_last=True):
-        connector = "└── " if is_last else "├── "
-        click.echo(f"{prefix}{connector}{node['name']}")
+    # Iterative walk: the stack holds (node, prefix, is_last) and children are pushed
+    # in reverse so they pop in display order
+    out = []
+    stack = [(structure, "", True)]
+    while stack:
+        node, prefix, is_last = stack.pop()
+        extension = _EXTENSIONS[is_last]
+        out.append(f"{prefix}{_CONNECTORS[is_last]}{node['name']}\n")
         
         if node['type'] == 'directory' and 'children' in node:
-            extension = "    " if is_last else "│   "
-            for i, child in enumerate(node['children']):
-                is_last_child = i == len(node['children']) - 1
-                print_tree(child, prefix + extension, is_last_child)
+            children = node['children']
+            child_prefix = prefix + extension
+            last = len(children) - 1
+            for i in range(last, -1, -1):
+                stack.append((children[i], child_prefix, i == last))
         elif node['type'] == 'task':
             if 'title' in node and node['title']:
-                extension = "    " if is_last else "│   "
-                click.echo(f"{prefix}{extension}    {node['title']}")
+                out.append(f"{prefix}{extension}    {node['title']}\n")
     
-    print_tree(structure, "", True)
+    click.echo("".join(out), nl=False)
 
 
 @main.command()
@@ -241,17 +272,15 @@ def search(ctx, query, status, priority, tags, path_pattern, max_results, full):
     """Search for tasks"""
     searcher = ctx.obj['searcher']
     
-    metadata_filters = {}
-    if status:
-        metadata_filters['status'] = status
-    if priority:
-        metadata_filters['priority'] = priority
-    if tags:
-        metadata_filters['tags'] = list(tags)
+    metadata_filters = {
+        key: value
+        for key, value in (('status', status), ('priority', priority), ('tags', list(tags)))
+        if value
+    } or None
     
     results = searcher.search(
         query=query,
-        metadata_filters=metadata_filters if metadata_filters else None,
+        metadata_filters=metadata_filters,
         path_pattern=path_pattern,
         max_results=max_results,
         include_content=full
@@ -261,18 +290,19 @@ def search(ctx, query, status, priority, tags, path_pattern, max_results, full):
         click.echo("No tasks found.")
         return
     
-    click.echo(f"Found {len(results)} task(s):\n")
+    out = [f"Found {len(results)} task(s):\n\n"]
     for result in results:
-        click.echo(f"• {result['path']} (score: {result['score']})")
-        click.echo(f"  {result['title']}")
+        out.append(f"• {result['path']} (score: {result['score']})\n  {result['title']}\n")
         
         if 'snippet' in result:
-            click.echo(f"  {result['snippet']}")
+            out.append(f"  {result['snippet']}\n")
         
         if full and 'content' in result:
-            click.echo(f"\n{result['content']}\n")
+            out.append(f"\n{result['content']}\n\n")
         
-        click.echo()
+        out.append("\n")
+    
+    click.echo("".join(out), nl=False)
 
 
 @main.command()
@@ -288,9 +318,7 @@ def tags(ctx, project):
         click.echo("No tags found.")
         return
     
-    click.echo("Tags:")
-    for tag in sorted(all_tags):
-        click.echo(f"  • {tag}")
+    click.echo("Tags:\n" + "\n".join(f"  • {tag}" for tag in sorted(all_tags)))
 
 
 @main.command()
@@ -298,17 +326,12 @@ def tags(ctx, project):
 @click.argument('new_path')
 @click.option('--project', default=None, help='Project name to scope operation')
 @click.pass_context
+@handle_project_errors
 def move(ctx, old_path, new_path, project):
     """Move/rename a task"""
     manager = ctx.obj['manager']
     
-    from .utils import project_resolution_error_msg
-
-    try:
-        success = manager.move_task(old_path, new_path, project=project)
-    except ValueError as e:
-        click.echo(project_resolution_error_msg(e), err=True)
-        sys.exit(2)
+    success = manager.move_task(old_path, new_path, project=project)
 
     if success:
         click.echo(f"✓ Moved task from {old_path} to {new_path}")
@@ -0,0 +1,356 @@
+"""
+Task Index - Persisted index of task frontmatter, kept fresh with stat calls
+"""
+
+import os
+import sys
+import json
+import math
+import zlib
+import threading
+import weakref
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+try:
+    # Optional (`pip install CopilotTaskMaster[orjson]`); several times faster than the
+    # stdlib json module at loading and saving large sidecars
+    import orjson
+except ImportError:
+    orjson = None
+
+from .cache import FrontmatterCache, default_cache, _load_post
+from .task_manager import _iter_md_entries
+
+# Sidecar file (inside base_path) persisting the index between processes
+INDEX_FILE = ".taskmaster_index.json"
+_INDEX_VERSION = 5
+
+# Size of the per-file trigram Bloom filter used to skip files a text query cannot match
+_BLOOM_BITS = 4096
+
+
+def _trigram_bits(*texts: str) -> int:
+    """Bloom filter (as an int bitmask) of the lowercase character trigrams in `texts`.
+
+    Uses crc32 rather than `hash()` so the bits are stable across processes and can be
+    persisted. Text shorter than three characters contributes no bits.
+    """
+    grams = set()
+    for text in texts:
+        text = text.lower()
+        grams.update(text[i:i + 3] for i in range(len(text) - 2))
+    bloom = bytearray(_BLOOM_BITS // 8)
+    for gram in grams:
+        bit = zlib.crc32(gram.encode('utf-8')) % _BLOOM_BITS
+        bloom[bit >> 3] |= 1 << (bit & 7)
+    return int.from_bytes(bloom, 'little')
+
+
+def _normalize_values(value: Any) -> List[str]:
+    """Normalize a metadata value (scalar or list) to a list of lowercase strings.
+
+    The strings are interned: statuses, priorities and tags repeat across the whole
+    corpus, so the index holds one copy of each and comparisons hit the identity fast path.
+    """
+    if isinstance(value, str):
+        return [sys.intern(value.lower())]
+    if isinstance(value, list):
+        return [sys.intern(str(v).lower()) for v in value]
+    return [sys.intern(str(value).lower())]
+
+
+def _normalize_fields(metadata: Dict[str, Any]) -> Dict[str, List[str]]:
+    """Normalize every metadata field for the posting lists.
+
+    Tags count only when they are a list or a single string, as in `get_all_tags`;
+    an empty `tags:` (None) or any other scalar indexes no tags at all.
+    """
+    fields = {key: _normalize_values(value) for key, value in metadata.items()}
+    if 'tags' in fields and not isinstance(metadata['tags'], (str, list)):
+        fields['tags'] = []
+    return fields
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize the sidecar, with orjson when it is installed"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            # e.g. strings orjson rejects (lone surrogates); the stdlib escapes them
+            pass
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _json_native(value: Any) -> bool:
+    """Whether `value` survives a JSON round trip unchanged (no dates, tuples, ...)
+
+    Non-finite floats and integers outside the 64-bit range are excluded because orjson
+    cannot round-trip them.
+    """
+    if value is None or isinstance(value, (str, bool)):
+        return True
+    if isinstance(value, int):
+        return -2**63 <= value < 2**64
+    if isinstance(value, float):
+        return math.isfinite(value)
+    if isinstance(value, list):
+        return all(_json_native(v) for v in value)
+    if isinstance(value, dict):
+        return all(isinstance(k, str) and _json_native(v) for k, v in value.items())
+    return False
+
+
+_shared_indexes: "weakref.WeakValueDictionary[tuple, TaskIndex]" = weakref.WeakValueDictionary()
+_shared_lock = threading.Lock()
+
+
+class TaskIndex:
+    """Index of task frontmatter under a base path, persisted to `INDEX_FILE`
+
+    Each record maps a relative path to (mtime_ns, size, {field: normalized values},
+    trigram Bloom filter as hex or None until a text query needs it, raw metadata or None
+    when it is not JSON-native). Posting lists (field -> value -> paths, field -> paths)
+    and the decoded Bloom filters are derived from the records.
+
+    Records are validated against each file's stat data on every lookup, so edits made
+    through TaskManager or by hand are picked up without explicit invalidation.
+    """
+
+    def __init__(self, base_path: Path, persist: bool = True, cache: Optional[FrontmatterCache] = None):
+        """
+        Initialize TaskIndex
+
+        Args:
+            base_path: Root directory for task cards
+            persist: Load and save the records in `INDEX_FILE`
+            cache: Parsed-file cache used when Bloom filters need full task bodies
+        """
+        self.base_path = base_path
+        self.persist = persist
+        self.cache = cache if cache is not None else default_cache
+        self._loaded = False
+        self._built = False
+        self._records: Dict[str, tuple] = {}
+        self._postings: Dict[str, Dict[str, Set[str]]] = {}
+        self._fields: Dict[str, Set[str]] = {}
+        self._blooms: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, base_path: Path, persist: bool = True, cache: Optional[FrontmatterCache] = None) -> "TaskIndex":
+        """The process-wide index for (base_path, persist, cache), created on first use.
+
+        Searchers over the same tree share one index, so a new searcher reuses the loaded
+        records and posting lists instead of re-reading the sidecar. Records are validated
+        against stat data on every lookup, so sharing never serves stale results. The
+        index is dropped once no searcher references it.
+        """
+        cache = cache if cache is not None else default_cache
+        # The index keeps `cache` alive, so its id cannot be reused while the entry exists
+        key = (str(base_path), persist, id(cache))
+        with _shared_lock:
+            index = _shared_indexes.get(key)
+            if index is None:
+                index = _shared_indexes[key] = cls(base_path, persist, cache)
+            return index
+
+    def load(self) -> Dict[str, tuple]:
+        """Read persisted records, ignoring a missing or unreadable sidecar"""
+        try:
+            with open(self.base_path / INDEX_FILE, 'rb') as f:
+                data = _loads(f.read())
+            if data.get('version') != _INDEX_VERSION:
+                return {}
+            return {
+                rel: (mtime, size, {
+                    sys.intern(key): [sys.intern(v) for v in values] for key, values in fields.items()
+                }, bloom, metadata)
+                for rel, (mtime, size, fields, bloom, metadata) in data['records'].items()
+            }
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return {}
+
+    def save(self) -> None:
+        """Persist records atomically; failures (e.g. read-only dirs) are ignored"""
+        target = self.base_path / INDEX_FILE
+        tmp = target.with_name(f"{INDEX_FILE}.{os.getpid()}.tmp")
+        try:
+            with open(tmp, 'wb') as f:
+                f.write(_dumps({'version': _INDEX_VERSION, 'records': self._records}))
+            os.replace(tmp, target)
+        except OSError:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+
+    def _refresh(self) -> None:
+        """Bring the records up to date with the files on disk.
+
+        Only stat calls are needed for unchanged files; new or modified files have just
+        their frontmatter block parsed. Must be called with `_lock` held.
+        """
+        if not self._loaded:
+            self._loaded = True
+            self._records = self.load() if self.persist else {}
+
+        records = {}
+        updates = []
+        skip = len(str(self.base_path)) + 1
+        for entry in _iter_md_entries(self.base_path):
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            rel = entry.path[skip:].replace(os.sep, '/')
+            old = self._records.get(rel)
+            if old is not None and old[0] == st.st_mtime_ns and old[1] == st.st_size:
+                records[rel] = old
+                continue
+            try:
+                metadata = _load_post(entry.path, 0).metadata
+            except Exception:
+                continue
+            fields = _normalize_fields(metadata)
+            raw = metadata if _json_native(metadata) else None
+            records[rel] = (st.st_mtime_ns, st.st_size, fields, None, raw)
+            updates.append((rel, old))
+
+        removed = [(rel, record) for rel, record in self._records.items() if rel not in records]
+        if updates or removed:
+            self._records = records
+            if self._built:
+                # Patch the derived structures instead of rebuilding them
+                for rel, record in removed:
+                    self._unpost(rel, record)
+                for rel, old in updates:
+                    if old is not None:
+                        self._unpost(rel, old)
+                    self._post(rel, records[rel])
+            if self.persist:
+                self.save()
+
+        if not self._built:
+            self._postings = {}
+            self._fields = {}
+            self._blooms = {}
+            for rel, record in self._records.items():
+                self._post(rel, record)
+            self._built = True
+
+    def _post(self, rel: str, record: tuple) -> None:
+        """Add a record to the posting lists"""
+        for key, values in record[2].items():
+            self._fields.setdefault(key, set()).add(rel)
+            by_value = self._postings.setdefault(key, {})
+            for value in values:
+                by_value.setdefault(value, set()).add(rel)
+
+    def _unpost(self, rel: str, record: tuple) -> None:
+        """Remove a record from the posting lists and Bloom filters, dropping emptied entries"""
+        self._blooms.pop(rel, None)
+        for key, values in record[2].items():
+            paths = self._fields.get(key)
+            if paths is not None:
+                paths.discard(rel)
+                if not paths:
+                    del self._fields[key]
+            by_value = self._postings.get(key, {})
+            for value in values:
+                paths = by_value.get(value)
+                if paths is not None:
+                    paths.discard(rel)
+                    if not paths:
+                        del by_value[value]
+            if not by_value:
+                self._postings.pop(key, None)
+
+    def _ensure_blooms(self) -> None:
+        """Compute the trigram Bloom filter of every indexed file that lacks one.
+
+        Needs the full file, so it only runs for text queries; the parses go through the
+        shared cache and are reused when the query scores the files. Must be called with
+        `_lock` held, after `_refresh`.
+        """
+        changed = False
+        blooms = self._blooms
+        for rel, (mtime, size, fields, bloom, raw) in self._records.items():
+            if bloom is not None:
+                if rel not in blooms:
+                    blooms[rel] = int(bloom, 16)
+                continue
+            try:
+                post = self.cache.get(self.base_path / rel)
+            except Exception:
+                continue
+            bits = _trigram_bits(str(post.get('title', '')), post.content)
+            self._records[rel] = (mtime, size, fields, format(bits, 'x'), raw)
+            blooms[rel] = bits
+            changed = True
+
+        if changed and self.persist:
+            self.save()
+
+    def lookup(self, filters: Dict[str, Any], match_all: bool = False, query: str = "") -> Set[str]:
+        """Return relative paths whose metadata satisfies `filters`.
+
+        Same semantics as `TaskSearcher._matches_metadata`, answered from the posting
+        lists. With a `query`, files whose Bloom filter rules out one of its trigrams are
+        dropped too. Empty `filters` and `query` select every indexed task.
+        """
+        with self._lock:
+            self._refresh()
+            matched = self._match_postings(filters, match_all)
+            query_bits = _trigram_bits(query) if query else 0
+            if query_bits and matched:
+                self._ensure_blooms()
+                blooms = self._blooms
+                # Files whose Bloom filter could not be computed are kept
+                matched = {rel for rel in matched if blooms.get(rel, query_bits) & query_bits == query_bits}
+            return matched
+
+    def _match_postings(self, filters: Dict[str, Any], match_all: bool) -> Set[str]:
+        """Posting-list part of `lookup`; must be called with `_lock` held"""
+        matched: Optional[Set[str]] = None
+        for key, value in filters.items():
+            by_value = self._postings.get(key, {})
+            if isinstance(value, list):
+                sets = [by_value.get(v, set()) for v in _normalize_values(value)]
+                if not sets:
+                    paths = set(self._fields.get(key, ())) if match_all else set()
+                elif match_all:
+                    # Start from the smallest posting list so the intersection stays small
+                    sets.sort(key=len)
+                    paths = set.intersection(*sets)
+                else:
+                    paths = set.union(*sets)
+            else:
+                paths = set(by_value.get(_normalize_values(value)[0], ()))
+            matched = paths if matched is None else matched & paths
+            if not matched:
+                return set()
+        return matched if matched is not None else set(self._records)
+
+    def metadata(self, rel: str) -> Optional[Dict[str, Any]]:
+        """Raw frontmatter of an indexed task as of the last refresh.
+
+        None when the task is not indexed or its metadata is not JSON-native (dates and
+        the like), in which case the file has to be parsed. The dict is shared and must
+        not be modified.
+        """
+        record = self._records.get(rel)
+        return record[4] if record is not None else None
+
+    def tags(self, prefix: str = "") -> Set[str]:
+        """All normalized tags, optionally limited to paths starting with `prefix`"""
+        with self._lock:
+            self._refresh()
+            by_tag = self._postings.get('tags', {})
+            if not prefix:
+                return set(by_tag)
+            return {tag for tag, paths in by_tag.items() if any(p.startswith(prefix) for p in paths)}
@@ -4,13 +4,18 @@ MCP Server - Model Context Protocol integration for LLM interaction
 
 import os
 import json
-from typing import Any, Dict, List
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+from jsonschema.exceptions import best_match
+from jsonschema.validators import validator_for
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 
+from .cache import FrontmatterCache
 from .task_manager import TaskManager
 from .search import TaskSearcher
+from .utils import project_resolution_error_msg
 
 
 # Initialize server
@@ -25,459 +30,622 @@ def get_managers():
     global _task_manager, _task_searcher
     if _task_manager is None:
         tasks_dir = os.environ.get('TASKMASTER_TASKS_DIR', './tasks')
-        _task_manager = TaskManager(tasks_dir)
-        _task_searcher = TaskSearcher(tasks_dir)
+        # One parse cache serves both, so a read_task followed by a search parses once
+        cache = FrontmatterCache()
+        _task_manager = TaskManager(tasks_dir, cache=cache)
+        _task_searcher = TaskSearcher(tasks_dir, cache_size=128, cache=cache)
     return _task_manager, _task_searcher
 
 
-# Module-level aliases for tests and external usage
-# Tests expect `task_manager` and `task_searcher` to be importable
-task_manager, task_searcher = get_managers()
-
-
-@app.list_tools()
-async def list_tools() -> List[Tool]:
-    """List available tools for the LLM"""
-    return [
-        Tool(
-            name="create_task",
-            description="Create a new task card in markdown format",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "Relative path for the task (e.g., 'project1/task1.md')"
-                    },
-                    "project": {
-                        "type": "string",
-                        "description": "Project name to scope the task (optional)"
-                    },
-                    "title": {
-                        "type": "string",
-                        "description": "Task title"
-                    },
-                    "content": {
-                        "type": "string",
-                        "description": "Task content in markdown"
-                    },
-                    "status": {
-                        "type": "string",
-                        "description": "Task status (open, in-progress, done, etc.)",
-                        "default": "open"
-                    },
-                    "priority": {
-                        "type": "string",
-                        "description": "Task priority (low, medium, high, critical)",
-                        "default": "medium"
-                    },
-                    "tags": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "List of tags"
-                    }
+def __getattr__(name: str):
+    """Lazy module-level `task_manager` / `task_searcher` aliases (PEP 562).
+
+    Kept importable for tests and external usage; the managers are only built on first access.
+    """
+    if name in ("task_manager", "task_searcher"):
+        manager, searcher = get_managers()
+        return manager if name == "task_manager" else searcher
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Schema properties shared by several tools
+_PATH_PROP = {
+    "type": "string",
+    "description": "Relative path to the task"
+}
+_PROJECT_PROP = {
+    "type": "string",
+    "description": "Project name to scope the task (optional)"
+}
+_FORMAT_PROP = {
+    "type": "string",
+    "enum": ["text", "json"],
+    "description": "Response format: readable text or compact JSON",
+    "default": "text"
+}
+
+# Tool definitions are static, so build them once at import time
+_TOOLS: List[Tool] = [
+    Tool(
+        name="create_task",
+        description="Create a new task card in markdown format",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "path": {
+                    "type": "string",
+                    "description": "Relative path for the task (e.g., 'project1/task1.md')"
                 },
-                "required": ["path", "title"]
-            }
-        ),
-        Tool(
-            name="read_task",
-            description="Read a task card by its path",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "Relative path to the task"
-                    },
-                    "project": {
-                        "type": "string",
-                        "description": "Project name to scope the task (optional)"
-                    }
+                "project": _PROJECT_PROP,
+                "title": {
+                    "type": "string",
+                    "description": "Task title"
                 },
-                "required": ["path"]
-            }
-        ),
-        Tool(
-            name="update_task",
-            description="Update an existing task card",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "Relative path to the task"
-                    },
-                    "project": {
-                        "type": "string",
-                        "description": "Project name to scope the task (optional)"
-                    },
-                    "title": {
-                        "type": "string",
-                        "description": "New title (optional)"
-                    },
-                    "content": {
-                        "type": "string",
-                        "description": "New content (optional)"
-                    },
-                    "metadata": {
-                        "type": "object",
-                        "description": "Metadata to update (merged with existing)"
-                    }
+                "content": {
+                    "type": "string",
+                    "description": "Task content in markdown"
                 },
-                "required": ["path"]
-            }
-        ),
-        Tool(
-            name="delete_task",
-            description="Delete a task card",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "Relative path to the task"
-                    },
-                    "project": {
-                        "type": "string",
-                        "description": "Project name to scope the task (optional)"
-                    }
+                "status": {
+                    "type": "string",
+                    "description": "Task status (open, in-progress, done, etc.)",
+                    "default": "open"
                 },
-                "required": ["path"]
-            }
-        ),
-        Tool(
-            name="list_tasks",
-            description="List tasks in a directory (token-efficient summary)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "subpath": {
-                        "type": "string",
-                        "description": "Subdirectory to list (empty for all)",
-                        "default": ""
-                    },
-                    "recursive": {
-                        "type": "boolean",
-                        "description": "Include subdirectories",
-                        "default": True
-                    },
-                    "project": {
-                        "type": "string",
-                        "description": "Project name to scope the listing (optional)"
-                    }
+                "priority": {
+                    "type": "string",
+                    "description": "Task priority (low, medium, high, critical)",
+                    "default": "medium"
                 },
-                "required": []
-            }
-        ),
-        Tool(
-            name="search_tasks",
-            description="Search tasks with text and metadata filters (token-efficient)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "query": {
-                        "type": "string",
-                        "description": "Text to search in title and content"
-                    },
-                    "status": {
-                        "type": "string",
-                        "description": "Filter by status"
-                    },
-                    "priority": {
-                        "type": "string",
-                        "description": "Filter by priority"
-                    },
-                    "tags": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Filter by tags"
-                    },
-                    "path_pattern": {
-                        "type": "string",
-                        "description": "Path pattern to search (e.g., 'project1/**')"
-                    },
-                    "max_results": {
-                        "type": "integer",
-                        "description": "Maximum results to return",
-                        "default": 20
-                    }
+                "tags": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "List of tags"
+                }
+            },
+            "required": ["path", "title"]
+        }
+    ),
+    Tool(
+        name="read_task",
+        description="Read a task card by its path",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "path": _PATH_PROP,
+                "project": _PROJECT_PROP
+            },
+            "required": ["path"]
+        }
+    ),
+    Tool(
+        name="update_task",
+        description="Update an existing task card",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "path": _PATH_PROP,
+                "project": _PROJECT_PROP,
+                "title": {
+                    "type": "string",
+                    "description": "New title (optional)"
                 },
-                "required": []
-            }
-        ),
-        Tool(
-            name="get_structure",
-            description="Get hierarchical folder structure (token-efficient overview)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "subpath": {
-                        "type": "string",
-                        "description": "Subdirectory to show structure for",
-                        "default": ""
-                    },
-                    "project": {
-                        "type": "string",
-                        "description": "Project name to scope the structure (optional)"
-                    }
+                "content": {
+                    "type": "string",
+                    "description": "New content (optional)"
+                },
+                "metadata": {
+                    "type": "object",
+                    "description": "Metadata to update (merged with existing)"
+                }
+            },
+            "required": ["path"]
+        }
+    ),
+    Tool(
+        name="delete_task",
+        description="Delete a task card",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "path": _PATH_PROP,
+                "project": _PROJECT_PROP
+            },
+            "required": ["path"]
+        }
+    ),
+    Tool(
+        name="list_tasks",
+        description="List tasks in a directory (token-efficient summary)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "subpath": {
+                    "type": "string",
+                    "description": "Subdirectory to list (empty for all)",
+                    "default": ""
+                },
+                "recursive": {
+                    "type": "boolean",
+                    "description": "Include subdirectories",
+                    "default": True
+                },
+                "project": {
+                    "type": "string",
+                    "description": "Project name to scope the listing (optional)"
                 },
-                "required": []
-            }
-        ),
-        Tool(
-            name="move_task",
-            description="Move or rename a task",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "old_path": {
-                        "type": "string",
-                        "description": "Current path"
-                    },
-                    "new_path": {
-                        "type": "string",
-                        "description": "New path"
-                    },
-                    "project": {
-                        "type": "string",
-                        "description": "Project name to scope the move (optional)"
+                "format": _FORMAT_PROP
+            },
+            "required": []
+        }
+    ),
+    Tool(
+        name="search_tasks",
+        description="Search tasks with text and metadata filters (token-efficient)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Text to search in title and content"
+                },
+                "status": {
+                    "type": "string",
+                    "description": "Filter by status"
+                },
+                "priority": {
+                    "type": "string",
+                    "description": "Filter by priority"
+                },
+                "tags": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Filter by tags"
+                },
+                "path_pattern": {
+                    "type": "string",
+                    "description": "Path pattern to search (e.g., 'project1/**')"
+                },
+                "max_results": {
+                    "type": "integer",
+                    "description": "Maximum results to return",
+                    "default": 20
+                },
+                "format": _FORMAT_PROP
+            },
+            "required": []
+        }
+    ),
+    Tool(
+        name="get_structure",
+        description="Get hierarchical folder structure (token-efficient overview)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "subpath": {
+                    "type": "string",
+                    "description": "Subdirectory to show structure for",
+                    "default": ""
+                },
+                "project": {
+                    "type": "string",
+                    "description": "Project name to scope the structure (optional)"
+                },
+                "format": _FORMAT_PROP
+            },
+            "required": []
+        }
+    ),
+    Tool(
+        name="move_task",
+        description="Move or rename a task",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "old_path": {
+                    "type": "string",
+                    "description": "Current path"
+                },
+                "new_path": {
+                    "type": "string",
+                    "description": "New path"
+                },
+                "project": {
+                    "type": "string",
+                    "description": "Project name to scope the move (optional)"
+                }
+            },
+            "required": ["old_path", "new_path"]
+        }
+    ),
+    Tool(
+        name="get_all_tags",
+        description="Get all unique tags across all tasks",
+        inputSchema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    ),
+    Tool(
+        name="batch_execute",
+        description="Run several tool calls in one request and return their combined output",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "calls": {
+                    "type": "array",
+                    "description": "Tool calls to run, in order",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "name": {
+                                "type": "string",
+                                "description": "Tool name (any tool except batch_execute)"
+                            },
+                            "arguments": {
+                                "type": "object",
+                                "description": "Arguments for the tool"
+                            }
+                        },
+                        "required": ["name"]
                     }
                 },
-                "required": ["old_path", "new_path"]
-            }
-        ),
-        Tool(
-            name="get_all_tags",
-            description="Get all unique tags across all tasks",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
+                "maxConcurrent": {
+                    "type": "integer",
+                    "description": "Maximum number of calls running at once",
+                    "default": 4
+                },
+                "stopOnError": {
+                    "type": "boolean",
+                    "description": "Run the calls one at a time, in order, and skip the rest once one fails",
+                    "default": False
+                }
+            },
+            "required": ["calls"]
+        }
+    )
+]
+
+
+# Input validators compiled once per tool. Left to the framework, every call would go through
+# jsonschema.validate, which re-checks the schema against its metaschema each time.
+_VALIDATORS = {tool.name: validator_for(tool.inputSchema)(tool.inputSchema) for tool in _TOOLS}
+
+
+def _validation_error(name: str, arguments: Dict[str, Any]) -> Optional[str]:
+    """Return an error message if `arguments` do not match the tool's input schema"""
+    error = best_match(_VALIDATORS[name].iter_errors(arguments))
+    return f"Input validation error: {error.message}" if error is not None else None
+
+
+@app.list_tools()
+async def list_tools() -> List[Tool]:
+    """List available tools for the LLM"""
+    return _TOOLS
+
+
+# Task metadata fields accepted as top-level tool arguments (create / search filters)
+_METADATA_KEYS = ("status", "priority", "tags")
+
+# Rows per TextContent item in list/search responses
+_CHUNK_ROWS = 50
+
+# Precomputed indentation for get_structure output
+_INDENTS = tuple("  " * i for i in range(32))
+
+
+def _text(text: str) -> List[TextContent]:
+    return [TextContent(type="text", text=text)]
+
+
+def _chunked(header: str, rows: List[Any], format_row) -> List[TextContent]:
+    """Format rows into several TextContent items of at most _CHUNK_ROWS rows each.
+
+    Concatenating the items' text gives the full response; the header goes in the first one.
+    """
+    chunks = []
+    for start in range(0, len(rows), _CHUNK_ROWS):
+        parts = [header] if start == 0 else []
+        parts.extend(format_row(row) for row in rows[start:start + _CHUNK_ROWS])
+        chunks.append(TextContent(type="text", text="".join(parts)))
+    return chunks
+
+
+def _json(data: Any) -> List[TextContent]:
+    # Compact separators keep the payload small; `str` covers YAML dates in metadata
+    return _text(json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=str))
+
+
+async def _create_task(arguments: Dict[str, Any]) -> List[TextContent]:
+    task_manager, _ = get_managers()
+
+    metadata = {key: arguments[key] for key in _METADATA_KEYS if key in arguments} or None
+
+    try:
+        result = task_manager.create_task(
+            path=arguments['path'],
+            title=arguments['title'],
+            content=arguments.get('content', ''),
+            metadata=metadata,
+            project=arguments.get('project')
         )
-    ]
+    except ValueError as e:
+        return _text(project_resolution_error_msg(e))
 
+    return _text(f"✓ Created task '{result['title']}' at {result['path']}")
 
-@app.call_tool()
-async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
-    """Handle tool calls from the LLM"""
-    task_manager, task_searcher = get_managers()
+
+async def _read_task(arguments: Dict[str, Any]) -> List[TextContent]:
+    task_manager, _ = get_managers()
+    path = arguments['path']
+
+    try:
+        task = task_manager.read_task(path, project=arguments.get('project'))
+    except ValueError as e:
+        return _text(project_resolution_error_msg(e))
+
+    if not task:
+        return _text(f"✗ Task not found: {path}")
+
+    # Format task info in a token-efficient way
+    parts = [f"**{task['title']}**\n\nPath: {task['path']}\n\n"]
+    
+    # Key metadata
+    metadata = task['metadata']
+    for key in ['status', 'priority', 'tags', 'created', 'updated']:
+        if key in metadata:
+            parts.append(f"{key.title()}: {metadata[key]}\n")
+    
+    parts.append(f"\n---\n\n{task['content']}")
     
+    return _text("".join(parts))
+
+
+async def _update_task(arguments: Dict[str, Any]) -> List[TextContent]:
+    task_manager, _ = get_managers()
+    path = arguments['path']
+
     try:
-        if name == "create_task":
-            from .utils import project_resolution_error_msg
+        result = task_manager.update_task(
+            path=path,
+            title=arguments.get('title'),
+            content=arguments.get('content'),
+            metadata=arguments.get('metadata'),
+            project=arguments.get('project')
+        )
+    except ValueError as e:
+        return _text(project_resolution_error_msg(e))
 
-            metadata = {}
-            if 'status' in arguments:
-                metadata['status'] = arguments['status']
-            if 'priority' in arguments:
-                metadata['priority'] = arguments['priority']
-            if 'tags' in arguments:
-                metadata['tags'] = arguments['tags']
+    if not result:
+        return _text(f"✗ Task not found: {path}")
+    
+    return _text(f"✓ Updated task: {result['path']}")
 
-            try:
-                result = task_manager.create_task(
-                    path=arguments['path'],
-                    title=arguments['title'],
-                    content=arguments.get('content', ''),
-                    metadata=metadata if metadata else None,
-                    project=arguments.get('project')
-                )
-            except ValueError as e:
-                return [TextContent(type="text", text=project_resolution_error_msg(e))]
-
-            return [TextContent(
-                type="text",
-                text=f"✓ Created task '{result['title']}' at {result['path']}"
-            )]
-        
-        elif name == "read_task":
-            from .utils import project_resolution_error_msg
 
-            try:
-                task = task_manager.read_task(arguments['path'], project=arguments.get('project'))
-            except ValueError as e:
-                return [TextContent(type="text", text=project_resolution_error_msg(e))]
-
-            if not task:
-                return [TextContent(
-                    type="text",
-                    text=f"✗ Task not found: {arguments['path']}"
-                )]
-
-            # Format task info in a token-efficient way
-            output = f"**{task['title']}**\n\n"
-            output += f"Path: {task['path']}\n\n"
-            
-            # Key metadata
-            for key in ['status', 'priority', 'tags', 'created', 'updated']:
-                if key in task['metadata']:
-                    output += f"{key.title()}: {task['metadata'][key]}\n"
-            
-            output += f"\n---\n\n{task['content']}"
-            
-            return [TextContent(type="text", text=output)]
-        
-        elif name == "update_task":
-            from .utils import project_resolution_error_msg
+async def _delete_task(arguments: Dict[str, Any]) -> List[TextContent]:
+    task_manager, _ = get_managers()
+    path = arguments['path']
 
-            try:
-                result = task_manager.update_task(
-                    path=arguments['path'],
-                    title=arguments.get('title'),
-                    content=arguments.get('content'),
-                    metadata=arguments.get('metadata'),
-                    project=arguments.get('project')
-                )
-            except ValueError as e:
-                return [TextContent(type="text", text=project_resolution_error_msg(e))]
-
-            if not result:
-                return [TextContent(
-                    type="text",
-                    text=f"✗ Task not found: {arguments['path']}"
-                )]
-            
-            return [TextContent(
-                type="text",
-                text=f"✓ Updated task: {result['path']}"
-            )]
-        
-        elif name == "delete_task":
-            from .utils import project_resolution_error_msg
+    try:
+        success = task_manager.delete_task(path, project=arguments.get('project'))
+    except ValueError as e:
+        return _text(project_resolution_error_msg(e))
 
-            try:
-                success = task_manager.delete_task(arguments['path'], project=arguments.get('project'))
-            except ValueError as e:
-                return [TextContent(type="text", text=project_resolution_error_msg(e))]
-
-            return [TextContent(
-                type="text",
-                text=f"✓ Deleted task: {arguments['path']}" if success 
-                     else f"✗ Task not found: {arguments['path']}"
-            )]
-        
-        elif name == "list_tasks":
-            from .utils import project_resolution_error_msg
+    return _text(
+        f"✓ Deleted task: {path}" if success 
+        else f"✗ Task not found: {path}"
+    )
 
-            try:
-                tasks = task_manager.list_tasks(
-                    subpath=arguments.get('subpath', ''),
-                    recursive=arguments.get('recursive', True),
-                    include_content=False,
-                    project=arguments.get('project')
-                )
-            except ValueError as e:
-                return [TextContent(type="text", text=project_resolution_error_msg(e))]
-
-            if not tasks:
-                return [TextContent(type="text", text="No tasks found.")]
-            
-            # Token-efficient summary
-            output = f"Found {len(tasks)} tasks:\n\n"
-            for task in tasks:
-                status = task['metadata'].get('status', 'unknown')
-                priority = task['metadata'].get('priority', '-')
-                output += f"• [{status}] {task['title']}\n  Path: {task['path']} | Priority: {priority}\n"
-            
-            return [TextContent(type="text", text=output)]
-        
-        elif name == "search_tasks":
-            metadata_filters = {}
-            if 'status' in arguments:
-                metadata_filters['status'] = arguments['status']
-            if 'priority' in arguments:
-                metadata_filters['priority'] = arguments['priority']
-            if 'tags' in arguments:
-                metadata_filters['tags'] = arguments['tags']
-            
-            results = task_searcher.search(
-                query=arguments.get('query', ''),
-                metadata_filters=metadata_filters if metadata_filters else None,
-                path_pattern=arguments.get('path_pattern', ''),
-                max_results=arguments.get('max_results', 20),
-                include_content=False
-            )
-            
-            if not results:
-                return [TextContent(type="text", text="No tasks found.")]
-            
-            # Token-efficient results
-            output = f"Found {len(results)} matching tasks:\n\n"
-            for r in results:
-                output += f"• {r['title']} (relevance: {r['score']})\n"
-                output += f"  Path: {r['path']}\n"
-                if 'snippet' in r:
-                    output += f"  Snippet: {r['snippet'][:100]}...\n"
-                output += "\n"
-            
-            return [TextContent(type="text", text=output)]
-        
-        elif name == "get_structure":
-            from .utils import project_resolution_error_msg
 
-            try:
-                structure = task_manager.get_structure(arguments.get('subpath', ''), project=arguments.get('project'))
-            except ValueError as e:
-                return [TextContent(type="text", text=project_resolution_error_msg(e))]
-
-            def format_tree(node, indent=0):
-                result = "  " * indent + f"📁 {node['name']}\n" if node['type'] == 'directory' else ""
-                
-                if node['type'] == 'directory' and 'children' in node:
-                    for child in node['children']:
-                        if child['type'] == 'directory':
-                            result += format_tree(child, indent + 1)
-                        else:
-                            status = child.get('metadata', {}).get('status', '?')
-                            result += "  " * (indent + 1) + f"📄 {child['title']} [{status}]\n"
-                
-                return result
-            
-            output = format_tree(structure)
-            return [TextContent(type="text", text=output or "Empty structure")]
-        
-        elif name == "move_task":
-            from .utils import project_resolution_error_msg
+async def _list_tasks(arguments: Dict[str, Any]) -> List[TextContent]:
+    task_manager, _ = get_managers()
 
-            try:
-                success = task_manager.move_task(
-                    arguments['old_path'],
-                    arguments['new_path'],
-                    project=arguments.get('project')
-                )
-            except ValueError as e:
-                return [TextContent(type="text", text=project_resolution_error_msg(e))]
-
-            return [TextContent(
-                type="text",
-                text=f"✓ Moved task" if success else "✗ Failed to move task"
-            )]
-        
-        elif name == "get_all_tags":
-            tags = task_searcher.get_all_tags(project=arguments.get('project'))
-            
-            if not tags:
-                return [TextContent(type="text", text="No tags found.")]
-            
-            output = "Tags: " + ", ".join(sorted(tags))
-            return [TextContent(type="text", text=output)]
-        
+    try:
+        tasks = await asyncio.to_thread(
+            task_manager.list_task_summaries,
+            subpath=arguments.get('subpath', ''),
+            recursive=arguments.get('recursive', True),
+            project=arguments.get('project')
+        )
+    except ValueError as e:
+        return _text(project_resolution_error_msg(e))
+
+    if arguments.get('format') == 'json':
+        return _json([
+            {'path': task.path, 'title': task.title, 'status': task.status, 'priority': task.priority}
+            for task in tasks
+        ])
+
+    if not tasks:
+        return _text("No tasks found.")
+    
+    # Token-efficient summary
+    def format_task(task):
+        status = task.status if task.status is not None else 'unknown'
+        priority = task.priority if task.priority is not None else '-'
+        return f"• [{status}] {task.title}\n  Path: {task.path} | Priority: {priority}\n"
+    
+    return _chunked(f"Found {len(tasks)} tasks:\n\n", tasks, format_task)
+
+
+async def _search_tasks(arguments: Dict[str, Any]) -> List[TextContent]:
+    _, task_searcher = get_managers()
+
+    metadata_filters = {key: arguments[key] for key in _METADATA_KEYS if key in arguments} or None
+    
+    results = await task_searcher.search_async(
+        query=arguments.get('query', ''),
+        metadata_filters=metadata_filters,
+        path_pattern=arguments.get('path_pattern', ''),
+        max_results=arguments.get('max_results', 20),
+        include_content=False
+    )
+    
+    if arguments.get('format') == 'json':
+        return _json([
+            {key: r[key] for key in ('path', 'title', 'score', 'snippet') if key in r}
+            for r in results
+        ])
+
+    if not results:
+        return _text("No tasks found.")
+    
+    # Token-efficient results
+    def format_result(r):
+        text = f"• {r['title']} (relevance: {r['score']})\n  Path: {r['path']}\n"
+        if 'snippet' in r:
+            text += f"  Snippet: {r['snippet'][:100]}...\n"
+        return text + "\n"
+    
+    return _chunked(f"Found {len(results)} matching tasks:\n\n", results, format_result)
+
+
+def _indent(level: int) -> str:
+    return _INDENTS[level] if level < len(_INDENTS) else "  " * level
+
+
+def _format_tree(root: Dict[str, Any]) -> str:
+    """Render a get_structure tree depth-first with an explicit stack.
+
+    Children keep their original order: directories are expanded where they appear and
+    tasks are written inline.
+    """
+    if root['type'] != 'directory':
+        return ""
+
+    parts = []
+    stack = [(root, 0)]
+    while stack:
+        node, level = stack.pop()
+        if node['type'] == 'directory':
+            parts.append(f"{_indent(level)}📁 {node['name']}\n")
+            # Push children reversed so they pop in display order
+            for child in reversed(node.get('children', [])):
+                stack.append((child, level + 1))
         else:
-            return [TextContent(
-                type="text",
-                text=f"Unknown tool: {name}"
-            )]
+            status = node.get('metadata', {}).get('status', '?')
+            parts.append(f"{_indent(level)}📄 {node['title']} [{status}]\n")
+    return "".join(parts)
+
+
+async def _get_structure(arguments: Dict[str, Any]) -> List[TextContent]:
+    task_manager, _ = get_managers()
+
+    try:
+        structure = await asyncio.to_thread(
+            task_manager.get_structure, arguments.get('subpath', ''), project=arguments.get('project')
+        )
+    except ValueError as e:
+        return _text(project_resolution_error_msg(e))
+
+    if arguments.get('format') == 'json':
+        return _json(structure)
+
+    return _text(_format_tree(structure) or "Empty structure")
+
+
+async def _move_task(arguments: Dict[str, Any]) -> List[TextContent]:
+    task_manager, _ = get_managers()
+
+    try:
+        success = task_manager.move_task(
+            arguments['old_path'],
+            arguments['new_path'],
+            project=arguments.get('project')
+        )
+    except ValueError as e:
+        return _text(project_resolution_error_msg(e))
+
+    return _text(f"✓ Moved task" if success else "✗ Failed to move task")
+
+
+async def _get_all_tags(arguments: Dict[str, Any]) -> List[TextContent]:
+    _, task_searcher = get_managers()
+
+    tags = await asyncio.to_thread(task_searcher.get_all_tags, project=arguments.get('project'))
     
-    except Exception as e:
-        return [TextContent(
-            type="text",
-            text=f"Error executing {name}: {str(e)}"
-        )]
+    if not tags:
+        return _text("No tags found.")
+    
+    return _text("Tags: " + ", ".join(sorted(tags)))
 
 
+async def _batch_execute(arguments: Dict[str, Any]) -> List[TextContent]:
+    calls = arguments.get('calls') or []
+    if not calls:
+        return _text("No calls given.")
 
+    semaphore = asyncio.Semaphore(max(1, arguments.get('maxConcurrent', 4)))
+
+    async def run_one(call: Dict[str, Any]) -> Tuple[bool, str]:
+        """Run one call and return (failed, output)"""
+        name = call.get('name')
+        handler = _HANDLERS.get(name) if name != "batch_execute" else None
+        if handler is None:
+            return True, f"Unknown tool: {name}"
+
+        arguments = call.get('arguments') or {}
+        error = _validation_error(name, arguments)
+        if error is not None:
+            return True, error
+
+        async with semaphore:
+            try:
+                result = await handler(arguments)
+            except Exception as e:
+                return True, f"Error executing {name}: {str(e)}"
+        output = "".join(item.text for item in result)
+        # Handlers report project and not-found errors as text rather than raising
+        return output.startswith("✗"), output
+
+    if arguments.get('stopOnError', False):
+        # Calls run one after another so "earlier" means earlier in the list
+        outputs = []
+        for call in calls:
+            failed, output = await run_one(call)
+            outputs.append(output)
+            if failed:
+                break
+        outputs.extend("Skipped: an earlier call failed" for _ in calls[len(outputs):])
+    else:
+        outputs = [output for _, output in await asyncio.gather(*(run_one(call) for call in calls))]
+
+    return _text("\n\n".join(
+        f"### [{i}] {call.get('name')}\n{output}"
+        for i, (call, output) in enumerate(zip(calls, outputs), 1)
+    ))
+
+
+# Tool name -> handler; every handler takes the raw arguments dict. Handlers that walk the
+# task tree run it in a worker thread so the event loop (and batch_execute siblings) keep going.
+_HANDLERS = {
+    "create_task": _create_task,
+    "read_task": _read_task,
+    "update_task": _update_task,
+    "delete_task": _delete_task,
+    "list_tasks": _list_tasks,
+    "search_tasks": _search_tasks,
+    "get_structure": _get_structure,
+    "move_task": _move_task,
+    "get_all_tags": _get_all_tags,
+    "batch_execute": _batch_execute,
+}
+
+
+@app.call_tool(validate_input=False)
+async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
+    """Handle tool calls from the LLM"""
+    handler = _HANDLERS.get(name)
+    if handler is None:
+        return _text(f"Unknown tool: {name}")
+
+    error = _validation_error(name, arguments)
+    if error is not None:
+        return _text(error)
+
+    try:
+        return await handler(arguments)
+    except Exception as e:
+        return _text(f"Error executing {name}: {str(e)}")
 
 
 async def run_server():
@@ -488,8 +656,14 @@ async def run_server():
 
 def main():
     """Main entry point for MCP server"""
-    import asyncio
-    asyncio.run(run_server())
+    # uvloop is optional (`pip install CopilotTaskMaster[uvloop]`); it cuts per-message
+    # overhead of the stdio JSON-RPC loop when available
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(run_server())
+    else:
+        uvloop.run(run_server())
 
 
 if __name__ == '__main__':
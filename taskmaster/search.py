@@ -2,23 +2,231 @@
 Task Searcher - Search functionality for task cards
 """
 
+import os
 import re
+import copy
+import asyncio
+import heapq
+import mmap
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Set
-import frontmatter
+from operator import attrgetter
+from typing import Iterable, Iterator, List, Dict, Any, NamedTuple, Optional, Set, Tuple
+
+from .cache import FrontmatterCache, default_cache
+from .index import INDEX_FILE, TaskIndex, _normalize_values
+from .task_manager import _iter_md_entries
+
+# Task files larger than this are scanned for text queries through mmap instead of being
+# decoded and parsed in full
+_MMAP_THRESHOLD = 16 * 1024
+
+
+# Metadata filters normalized for matching: (key, value was a list, lowercase values)
+_Filters = Tuple[Tuple[str, bool, frozenset], ...]
+
+
+def _normalize_filters(metadata_filters: Optional[Dict[str, Any]]) -> _Filters:
+    """Lowercase the filter values once so each candidate file only normalizes its own metadata"""
+    if not metadata_filters:
+        return ()
+    return tuple(
+        (key, isinstance(value, list), frozenset(_normalize_values(value)))
+        for key, value in metadata_filters.items()
+    )
+
+
+class _Hit(NamedTuple):
+    """A scored search match; turned into a result dict only if it makes the top K"""
+    path: str
+    title: Any
+    score: int
+    metadata: Dict[str, Any]
+    snippet: Optional[str] = None
+    content: Optional[str] = None
+
+    def as_result(self) -> Dict[str, Any]:
+        """The result dict returned by the public search methods.
+
+        `metadata` may be shared with the index or the cache, so the result gets a copy.
+        """
+        result = {'path': self.path, 'title': self.title, 'score': self.score,
+                  'metadata': copy.deepcopy(self.metadata)}
+        if self.content is not None:
+            result['content'] = self.content
+        elif self.snippet is not None:
+            result['snippet'] = self.snippet
+        return result
+
+
+_by_score = attrgetter('score')
+
+
+# Bytes of a mapped file lowered and searched at a time
+_SCAN_CHUNK = 1 << 20
+
+
+def _scan_mapped(md_file: Path, query_lower: str, context_chars: int = 100) -> Tuple[int, Optional[str]]:
+    """Count query matches in a task body by scanning the memory-mapped file.
+
+    The file is never decoded; pages are read in on demand and lowered a chunk at a time
+    so matching runs in `bytes.find`. `query_lower` must be ASCII. Returns
+    (number of non-overlapping matches, snippet around the first match or None).
+    """
+    needle = query_lower.encode('ascii')
+    overlap = len(needle) - 1
+    with open(md_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        size = len(mm)
+        # Skip the frontmatter block, as the parsed body would
+        body_start = 0
+        if mm[:3] == b'---':
+            end = mm.find(b'\n---', 3)
+            if end != -1:
+                nl = mm.find(b'\n', end + 1)
+                body_start = size if nl == -1 else nl + 1
+
+        count = 0
+        first = -1
+        pos = body_start
+        while pos < size:
+            limit = min(size, pos + _SCAN_CHUNK)
+            # Extend the chunk so matches straddling its end are seen, but only count
+            # those starting inside it
+            chunk = mm[pos:limit + overlap].lower()
+            i = chunk.find(needle)
+            next_pos = limit
+            while i != -1 and i < limit - pos:
+                if first == -1:
+                    first = pos + i
+                count += 1
+                next_pos = max(limit, pos + i + len(needle))
+                i = chunk.find(needle, i + len(needle))
+            pos = next_pos
+
+        if first == -1:
+            return 0, None
+        # A UTF-8 character takes at most 4 bytes, so 4 * context_chars bytes on each side
+        # hold the context characters; only that window is decoded, then trimmed to
+        # characters as `_extract_snippet` counts them
+        match_end = first + len(needle)
+        start = max(body_start, first - 4 * context_chars)
+        end = min(size, match_end + 4 * context_chars)
+        # Widen the window to whole UTF-8 sequences (continuation bytes are 0b10xxxxxx) so
+        # no character at its edges is lost
+        while start > body_start and mm[start] & 0xC0 == 0x80:
+            start -= 1
+        while end < size and mm[end] & 0xC0 == 0x80:
+            end += 1
+        before = mm[start:first].decode('utf-8', 'replace')
+        after = mm[match_end:end].decode('utf-8', 'replace')
+        more_before = start > body_start or len(before) > context_chars
+        more_after = end < size or len(after) > context_chars
+        before = before[-context_chars:] if context_chars else ""
+        snippet = (before + mm[first:match_end].decode('ascii') + after[:context_chars]).strip()
+        if more_before:
+            snippet = "..." + snippet
+        if more_after:
+            snippet = snippet + "..."
+        return count, snippet
+
+
+@lru_cache(maxsize=128)
+def _compile_path_pattern(path_pattern: str) -> Tuple[str, bool, "re.Pattern[str]"]:
+    """Compile a `path_pattern` glob for matching task paths relative to the base path.
+
+    Patterns not naming a `.md` file select the tasks directly inside the matched
+    directories (`project1` -> `project1/*.md`, `project1/**` -> every task below it).
+    `**` spans directories while `*` and `?` stay within one path segment, as in
+    `Path.glob`.
+
+    Returns:
+        (leading directory without wildcards, whether the walk must recurse, regex)
+    """
+    glob = path_pattern.strip('/')
+    if not glob.endswith('.md'):
+        glob += '/*.md'
+
+    parts = []
+    for token in re.split(r'(\*\*/|\*\*|\*|\?)', glob):
+        if token == '**/':
+            parts.append('(?:.*/)?')
+        elif token == '**':
+            parts.append('.*')
+        elif token == '*':
+            parts.append('[^/]*')
+        elif token == '?':
+            parts.append('[^/]')
+        else:
+            parts.append(re.escape(token))
+
+    literal = re.split(r'[*?]', glob, maxsplit=1)[0]
+    prefix = literal.rpartition('/')[0]
+    recursive = '/' in glob[len(prefix):].lstrip('/')
+    return prefix, recursive, re.compile(''.join(parts) + r'\Z')
 
 
 class TaskSearcher:
     """Searches markdown task cards efficiently"""
     
-    def __init__(self, base_path: str):
+    def __init__(
+        self,
+        base_path: str,
+        cache_size: int = 0,
+        persist_index: bool = True,
+        cache: Optional[FrontmatterCache] = None,
+        max_workers: int = 0
+    ):
         """
         Initialize TaskSearcher
         
         Args:
             base_path: Root directory for task cards
+            cache_size: Number of recent `search` results to keep (0 disables caching).
+                        Useful for long-lived processes such as the MCP server.
+            persist_index: Save the task index to `INDEX_FILE` so later processes
+                           only re-parse files that changed
+            cache: Parsed-file cache to read through (defaults to the process-wide one);
+                   pass the same instance to a TaskManager to share parses with it
+            max_workers: Read and score files for `search` on this many threads (0 or 1
+                         scans sequentially). Parsing and matching hold the GIL, so this
+                         only pays off when file reads are slow, e.g. on network drives.
         """
         self.base_path = Path(base_path).resolve()
+        self.max_workers = max_workers
+        self.cache_size = cache_size
+        self._search_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.persist_index = persist_index
+        self.cache = cache if cache is not None else default_cache
+        self._index: Optional[TaskIndex] = None
+
+    @property
+    def index(self) -> TaskIndex:
+        """Task index for the current `base_path` (replaced if base_path is re-pointed)"""
+        index = self._index
+        if index is None or index.base_path != self.base_path:
+            with self._cache_lock:
+                index = self._index
+                if index is None or index.base_path != self.base_path:
+                    index = self._index = TaskIndex.shared(self.base_path, self.persist_index, self.cache)
+        return index
+
+    def _tree_signature(self) -> int:
+        """Fingerprint every task file by (path, mtime, size) using only stat calls.
+
+        Any create, edit, move or delete - through TaskManager or by hand - changes it.
+        """
+        entries = []
+        for entry in _iter_md_entries(self.base_path):
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            entries.append((entry.path, st.st_mtime_ns, st.st_size))
+        return hash(frozenset(entries))
     
     def search(
         self,
@@ -39,73 +247,280 @@ class TaskSearcher:
             include_content: Include full content in results (token-expensive)
         
         Returns:
-            List of matching tasks with relevance scores
+            The `max_results` highest-scoring tasks, best first
         """
         if not self.base_path.exists():
             return []
+
+        if self.cache_size > 0:
+            key = self._search_key(query, metadata_filters, path_pattern, max_results, include_content)
+            signature, cached = self._cache_lookup(key)
+            if cached is not None:
+                return cached
+
+            results = self._search(query, metadata_filters, path_pattern, max_results, include_content)
+            self._cache_store(key, signature, results)
+            return results
+
+        return self._search(query, metadata_filters, path_pattern, max_results, include_content)
+
+    def _search_key(
+        self,
+        query: str,
+        metadata_filters: Optional[Dict[str, Any]],
+        path_pattern: str,
+        max_results: int,
+        include_content: bool
+    ) -> tuple:
+        """Hashable result-cache key for a search"""
+        filters_key = tuple(sorted(
+            (k, tuple(v) if isinstance(v, list) else v)
+            for k, v in (metadata_filters or {}).items()
+        ))
+        return (str(self.base_path), query, filters_key, path_pattern, max_results, include_content)
+
+    def _cache_lookup(self, key: tuple) -> tuple:
+        """Return (current tree signature, a copy of the cached results or None)"""
+        signature = self._tree_signature()
+        with self._cache_lock:
+            cached = self._search_cache.get(key)
+            if cached is None or cached[0] != signature:
+                return signature, None
+            self._search_cache.move_to_end(key)
+        # Stored results are never modified, so they can be copied outside the lock
+        return signature, copy.deepcopy(cached[1])
+
+    def _cache_store(self, key: tuple, signature: int, results: List[Dict[str, Any]]) -> None:
+        """Remember a copy of results computed against `signature`; callers keep theirs"""
+        results = copy.deepcopy(results)
+        with self._cache_lock:
+            self._search_cache[key] = (signature, results)
+            if len(self._search_cache) > self.cache_size:
+                self._search_cache.popitem(last=False)
+
+    def _search(
+        self,
+        query: str,
+        metadata_filters: Optional[Dict[str, Any]],
+        path_pattern: str,
+        max_results: int,
+        include_content: bool
+    ) -> List[Dict[str, Any]]:
+        """Uncached implementation of `search`"""
+        if self.max_workers > 1:
+            query_lower = query.lower() if query else ""
+            header_only = not (query_lower or include_content)
+            files = list(self._candidate_files(metadata_filters, path_pattern, query, header_only))
+            filters = _normalize_filters(metadata_filters)
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                scored = pool.map(
+                    lambda md_file: self._score_file(md_file, query_lower, filters, include_content, header_only),
+                    files
+                )
+                hits = [h for h in scored if h is not None]
+        else:
+            hits = self._iter_hits(query, metadata_filters, path_pattern, include_content)
+
+        # Top-K by relevance score over every match; ties keep filesystem order
+        return [hit.as_result() for hit in heapq.nlargest(max_results, hits, key=_by_score)]
+
+    def _candidate_files(
+        self,
+        metadata_filters: Optional[Dict[str, Any]],
+        path_pattern: str,
+        query: str = "",
+        use_index: bool = False
+    ) -> Iterable[Path]:
+        """Files that may match: a directory walk, or the index when `use_index` is set,
+        when filtering by metadata or for a text query long enough for the Bloom filters"""
+        if use_index or metadata_filters or len(query) >= 3:
+            candidates = self.index.lookup(metadata_filters or {}, query=query)
+            if path_pattern:
+                regex = _compile_path_pattern(path_pattern)[2]
+                candidates = {rel for rel in candidates if regex.match(rel)}
+            return [self.base_path / rel for rel in sorted(candidates)]
+
+        if not path_pattern:
+            return (Path(entry.path) for entry in _iter_md_entries(self.base_path))
+
+        # Only walk below the pattern's literal directory prefix
+        prefix, recursive, regex = _compile_path_pattern(path_pattern)
+        root = self.base_path / prefix if prefix else self.base_path
+        skip = len(str(self.base_path)) + 1
+        return (
+            Path(entry.path) for entry in _iter_md_entries(root, recursive)
+            if regex.match(entry.path[skip:].replace(os.sep, '/'))
+        )
+
+    def search_iter(
+        self,
+        query: str = "",
+        metadata_filters: Optional[Dict[str, Any]] = None,
+        path_pattern: str = "",
+        include_content: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yield matching tasks in filesystem order
         
-        pattern = f"{path_pattern}/*.md" if path_pattern and not path_pattern.endswith('.md') else "**/*.md"
-        results = []
+        Files are only read and scored as the caller consumes results, so stopping
+        after N matches leaves the rest of the tree untouched.
+        
+        Args:
+            query: Text to search in title and content
+            metadata_filters: Dict of metadata key-value pairs to filter by
+            path_pattern: Glob pattern to filter paths (e.g., 'project1/**')
+            include_content: Include full content in results (token-expensive)
+        
+        Yields:
+            Matching tasks with relevance scores (unsorted)
+        """
+        for hit in self._iter_hits(query, metadata_filters, path_pattern, include_content):
+            yield hit.as_result()
+
+    def _iter_hits(
+        self,
+        query: str,
+        metadata_filters: Optional[Dict[str, Any]],
+        path_pattern: str,
+        include_content: bool
+    ) -> Iterator[_Hit]:
+        """`search_iter` without building the result dicts"""
         query_lower = query.lower() if query else ""
+        # Metadata-only searches never look at the body, so skip reading it
+        header_only = not (query_lower or include_content)
+        filters = _normalize_filters(metadata_filters)
         
-        for md_file in self.base_path.glob(pattern):
-            try:
-                with open(md_file, 'r', encoding='utf-8') as f:
-                    post = frontmatter.load(f)
-                
-                # Apply metadata filters
-                if metadata_filters:
-                    if not self._matches_metadata(post.metadata, metadata_filters):
-                        continue
-                
-                # Calculate relevance score
-                score = 0
-                title = post.get('title', '')
-                content = post.content
+        for md_file in self._candidate_files(metadata_filters, path_pattern, query, header_only):
+            hit = self._score_file(md_file, query_lower, filters, include_content, header_only)
+            if hit is not None:
+                yield hit
+
+    async def search_async(
+        self,
+        query: str = "",
+        metadata_filters: Optional[Dict[str, Any]] = None,
+        path_pattern: str = "",
+        max_results: int = 50,
+        include_content: bool = False,
+        max_concurrent: int = 64
+    ) -> List[Dict[str, Any]]:
+        """
+        Async variant of `search` that reads candidate files concurrently
+        
+        Files are read and scored in worker threads so their I/O overlaps; at most
+        `max_concurrent` reads are in flight at once. Results (and caching) match `search`.
+        """
+        if not self.base_path.exists():
+            return []
+
+        key = self._search_key(query, metadata_filters, path_pattern, max_results, include_content)
+        if self.cache_size > 0:
+            signature, cached = await asyncio.to_thread(self._cache_lookup, key)
+            if cached is not None:
+                return cached
+
+        query_lower = query.lower() if query else ""
+        header_only = not (query_lower or include_content)
+        paths = await asyncio.to_thread(lambda: list(self._candidate_files(metadata_filters, path_pattern, query, header_only)))
+        filters = _normalize_filters(metadata_filters)
+        semaphore = asyncio.Semaphore(max_concurrent)
+
+        async def score(md_file: Path) -> Optional[_Hit]:
+            async with semaphore:
+                return await asyncio.to_thread(
+                    self._score_file, md_file, query_lower, filters, include_content, header_only
+                )
+
+        scored = await asyncio.gather(*(score(p) for p in paths))
+        results = [
+            hit.as_result()
+            for hit in heapq.nlargest(max_results, (h for h in scored if h is not None), key=_by_score)
+        ]
+
+        if self.cache_size > 0:
+            self._cache_store(key, signature, results)
+        return results
+
+    def _score_file(
+        self,
+        md_file: Path,
+        query_lower: str,
+        filters: _Filters,
+        include_content: bool,
+        header_only: bool
+    ) -> Optional[_Hit]:
+        """Score one file, or None if it does not match
+
+        `filters` are the search's metadata filters as returned by `_normalize_filters`.
+        """
+        # Candidates always live under base_path, so slice instead of Path.relative_to
+        rel = str(md_file)[len(str(self.base_path)) + 1:].replace(os.sep, '/')
+        if header_only:
+            # Metadata-only candidates come from the index's posting lists, which already
+            # applied the filters; answer from its raw frontmatter without re-checking
+            metadata = self.index.metadata(rel)
+            if metadata is not None:
+                return _Hit(rel, metadata.get('title', ''), 1, metadata)
+
+        try:
+            # Large bodies are scanned in place for ASCII queries; only the header is parsed
+            mapped = (
+                query_lower and not include_content and query_lower.isascii()
+                and os.path.getsize(md_file) > _MMAP_THRESHOLD
+            )
+            content_lower = None
+            if query_lower and not (header_only or mapped):
+                post, content_lower = self.cache.get_lowered(md_file)
+            else:
+                post = self.cache.get(md_file, header_only or mapped)
+            
+            # Apply metadata filters
+            if filters:
+                if not self._matches_metadata(post.metadata, filters):
+                    return None
+            
+            # Calculate relevance score
+            score = 0
+            title = post.get('title', '')
+            content = post.content
+            
+            snippet = None
+            if query_lower:
+                # Title matches are weighted higher
+                if query_lower in str(title).lower():
+                    score += 10
                 
-                if query_lower:
-                    # Title matches are weighted higher
-                    if query_lower in title.lower():
-                        score += 10
-                    
-                    # Content matches
-                    content_matches = content.lower().count(query_lower)
+                # Content matches: str.count/find use CPython's vectorized fastsearch,
+                # several times faster than a case-insensitive regex
+                if mapped:
+                    content_matches, snippet = _scan_mapped(md_file, query_lower)
                     score += content_matches
-                    
-                    # Skip if no matches
-                    if score == 0:
-                        continue
-                else:
-                    # If no query, all filtered tasks get score 1
-                    score = 1
-                
-                result = {
-                    'path': md_file.relative_to(self.base_path).as_posix(),
-                    'title': title,
-                    'score': score,
-                    'metadata': post.metadata
-                }
-                
-                if include_content:
-                    result['content'] = content
                 else:
-                    # Include a snippet if there's a query match
-                    if query_lower and query_lower in content.lower():
-                        result['snippet'] = self._extract_snippet(content, query_lower)
+                    content_matches = content_lower.count(query_lower)
+                    if content_matches:
+                        snippet = self._extract_snippet(content, content_lower.find(query_lower), len(query_lower))
+                    score += content_matches
                 
-                results.append(result)
-
-                # Early exit for performance: stop scanning once we have enough results
-                if len(results) >= max_results:
-                    break
+                # Skip if no matches
+                if score == 0:
+                    return None
+            else:
+                # If no query, all filtered tasks get score 1
+                score = 1
+            
+            hit = _Hit(
+                rel,
+                title,
+                score,
+                post.metadata,
+                snippet,
+                # Full content only when requested (token-expensive); otherwise the snippet
+                content if include_content else None
+            )
+        except Exception:
+            return None
 
-            except Exception as e:
-                continue
-        
-        # Sort by relevance score
-        results.sort(key=lambda x: x['score'], reverse=True)
-        
-        return results[:max_results]
+        return hit
     
     def search_by_tags(
         self,
@@ -129,16 +544,24 @@ class TaskSearcher:
         if not tags_lower:
             return results
 
-        for md_file in self.base_path.glob("**/*.md"):
+        tag_filter = {'tags': tags_lower}
+        filters = _normalize_filters(tag_filter)
+        candidates = self.index.lookup(tag_filter, match_all=match_all)
+        for rel in sorted(candidates):
             try:
-                with open(md_file, 'r', encoding='utf-8') as f:
-                    post = frontmatter.load(f)
+                # Posting-list hits are exact; only tasks parsed from disk are re-checked
+                metadata = self.index.metadata(rel)
+                if metadata is None:
+                    metadata = self.cache.get(self.base_path / rel, header_only=True).metadata
+                    matched = self._matches_metadata(metadata, filters, match_all=match_all)
+                else:
+                    matched = True
 
-                if self._matches_metadata(post.metadata, {'tags': tags_lower}, match_all=match_all):
+                if matched:
                     results.append({
-                        'path': md_file.relative_to(self.base_path).as_posix(),
-                        'title': post.get('title', ''),
-                        'metadata': post.metadata
+                        'path': rel,
+                        'title': metadata.get('title', ''),
+                        'metadata': copy.deepcopy(metadata)
                     })
 
                 if len(results) >= max_results:
@@ -158,25 +581,34 @@ class TaskSearcher:
         Returns:
             Set of all tags
         """
-        tags = set()
-
         # Determine search root based on project param
-        if project:
-            search_root = self.base_path / project
-            if not search_root.exists():
-                return tags
-            iterator = search_root.glob("**/*.md")
-        else:
-            iterator = self.base_path.glob("**/*.md")
+        search_root = self.base_path / project if project else self.base_path
+        if not search_root.exists():
+            return set()
+
+        try:
+            prefix = f"{search_root.relative_to(self.base_path).as_posix()}/" if project else ""
+        except ValueError:
+            # Project outside the base path: not covered by the index
+            return self._collect_tags(search_root)
+
+        # The tag posting list already holds every normalized tag; only files changed
+        # since the last refresh have their frontmatter parsed
+        return self.index.tags(prefix)
+
+    def _collect_tags(self, search_root: Path) -> Set[str]:
+        """Uncached implementation of `get_all_tags`"""
+        tags = set()
         
-        for md_file in iterator:
+        for entry in _iter_md_entries(search_root):
             try:
-                with open(md_file, 'r', encoding='utf-8') as f:
-                    post = frontmatter.load(f)
+                post = self.cache.get(entry.path, header_only=True, st=entry.stat())
                 
                 task_tags = post.metadata.get('tags', [])
                 if isinstance(task_tags, str):
                     task_tags = [task_tags]
+                elif not isinstance(task_tags, list):
+                    continue
                 # Normalize tags to lowercase strings
                 tags.update(str(t).lower() for t in task_tags)
             except Exception:
@@ -184,53 +616,40 @@ class TaskSearcher:
         
         return tags
     
-    def _matches_metadata(self, metadata: Dict[str, Any], filters: Dict[str, Any], match_all: bool = False) -> bool:
+    def _matches_metadata(self, metadata: Dict[str, Any], filters: _Filters, match_all: bool = False) -> bool:
         """Check if metadata matches all filters (case-insensitive, flexible list/scalar handling)
 
+        `filters` come from `_normalize_filters`, so the filter values are lowercased once
+        per search rather than once per file.
+
         For list-valued filters:
             - if match_all is False (default): return True if any filter value is present in metadata
             - if match_all is True: return True only if all filter values are present in metadata
         """
-        for key, value in filters.items():
+        for key, is_list, filter_values in filters:
             if key not in metadata:
                 return False
 
-            meta_value = metadata[key]
-
             # Normalize metadata values to list of lowercase strings
-            if isinstance(meta_value, str):
-                meta_list = [meta_value.lower()]
-            elif isinstance(meta_value, list):
-                meta_list = [str(v).lower() for v in meta_value]
-            else:
-                meta_list = [str(meta_value).lower()]
+            meta_list = _normalize_values(metadata[key])
 
-            # Normalize filter values to list of lowercase strings
-            if isinstance(value, list):
-                filter_list = [str(v).lower() for v in value]
+            if is_list:
                 if match_all:
-                    if not all(f in meta_list for f in filter_list):
+                    if not filter_values.issubset(meta_list):
                         return False
                 else:
-                    if not any(f in meta_list for f in filter_list):
+                    if filter_values.isdisjoint(meta_list):
                         return False
             else:
-                if str(value).lower() not in meta_list:
+                if next(iter(filter_values)) not in meta_list:
                     return False
 
         return True
     
-    def _extract_snippet(self, content: str, query: str, context_chars: int = 100) -> str:
-        """Extract a snippet around the query match"""
-        query_lower = query.lower()
-        content_lower = content.lower()
-        
-        index = content_lower.find(query_lower)
-        if index == -1:
-            return content[:200] + "..." if len(content) > 200 else content
-        
+    def _extract_snippet(self, content: str, index: int, length: int, context_chars: int = 100) -> str:
+        """Extract a snippet around the query match at `index`"""
         start = max(0, index - context_chars)
-        end = min(len(content), index + len(query) + context_chars)
+        end = min(len(content), index + length + context_chars)
         
         snippet = content[start:end]
         if start > 0:
@@ -4,25 +4,103 @@ Task Manager - Core functionality for managing markdown task cards
 
 import os
 import re
+import copy
+import stat
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Any, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 import frontmatter
 
+from .cache import FrontmatterCache, default_cache, _load_post, _YAML_HANDLER
+from .utils import ProjectResolutionError
+
+
+class TaskSummary(NamedTuple):
+    """Lightweight task record used for listings that don't need the full metadata"""
+    path: str
+    title: str
+    status: Optional[str]
+    priority: Optional[str]
+    tags: Tuple[str, ...]
+
+
+def _iter_md_entries(root: Path, recursive: bool = True) -> Iterator[os.DirEntry]:
+    """Yield `os.DirEntry` objects for the `.md` files under `root`.
+
+    Uses `os.scandir`, whose entries carry the file type from the directory listing, so
+    telling files from directories costs no extra stat calls (unlike `Path.glob`).
+    Directory symlinks are not followed.
+    """
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                # Directories first: a folder named `*.md` is walked, not skipped
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        stack.append(entry.path)
+                elif entry.name.endswith('.md') and entry.is_file():
+                    yield entry
+
+
+@lru_cache(maxsize=4096)
+def _relative_task_path(project: Optional[str], path: str) -> str:
+    """Pure part of `TaskManager._resolve_path`: the POSIX path relative to the base path.
+
+    Depends only on its arguments, so results are memoized; invalid input raises
+    ValueError, which is not cached.
+    """
+    p = Path(path)
+    if p.is_absolute():
+        raise ProjectResolutionError("path must be relative")
+    if any(part == ".." for part in p.parts):
+        raise ProjectResolutionError("path must not contain parent references")
+
+    # If project is not provided, the first path part is treated as project when present.
+    if project is None:
+        if len(p.parts) >= 2:
+            project = p.parts[0]
+            rest = Path(*p.parts[1:])
+        else:
+            # No project specified anywhere: error out — callers must be explicit
+            raise ProjectResolutionError("project must be specified either as argument or as the top-level folder in path")
+    else:
+        # Project was provided explicitly — interpret the path relative to that project.
+        # If the path redundantly includes the same project prefix (e.g., 'proj/file'), strip it.
+        if len(p.parts) >= 2 and p.parts[0] == project:
+            rest = Path(*p.parts[1:])
+        else:
+            rest = p
+
+    return (Path(project) / rest).as_posix()
+
 
 class TaskManager:
     """Manages markdown task cards in a hierarchical folder structure"""
     
-    def __init__(self, base_path: str = None):
+    def __init__(self, base_path: str = None, cache: Optional[FrontmatterCache] = None, max_workers: int = 0):
         """
         Initialize TaskManager
         
         Args:
             base_path: Root directory for task cards. Defaults to TASKMASTER_TASKS_DIR env var or ./tasks
+            cache: Parsed-file cache to read through (defaults to the process-wide one);
+                   pass the same instance to a TaskSearcher to share parses with it
+            max_workers: Read task files for `list_tasks` on this many threads (0 or 1 reads
+                         sequentially). Only pays off when file reads are slow, e.g. on
+                         network drives; cached reads are faster sequentially.
         """
         if base_path is None:
             base_path = os.environ.get('TASKMASTER_TASKS_DIR', './tasks')
         self.base_path = Path(base_path).resolve()
+        self.cache = cache if cache is not None else default_cache
+        self.max_workers = max_workers
         self.base_path.mkdir(parents=True, exist_ok=True)
 
     def _resolve_path(self, project: Optional[str], path: str):
@@ -37,31 +115,66 @@ class TaskManager:
           ValueError is raised — callers must explicitly provide a project.
         - `path` must be relative and must not contain parent ('..') references.
         """
-        p = Path(path)
-        if p.is_absolute():
-            raise ValueError("path must be relative")
-        if any(part == ".." for part in p.parts):
-            raise ValueError("path must not contain parent references")
+        relative_posix = _relative_task_path(project, path)
+        return self.base_path / relative_posix, relative_posix
+    
+    def _write_post(self, full_path: Path, post: frontmatter.Post) -> None:
+        """Write a task file atomically and prime the cache with a copy of the written Post.
 
-        # If project is not provided, the first path part is treated as project when present.
-        if project is None:
-            if len(p.parts) >= 2:
-                project = p.parts[0]
-                rest = Path(*p.parts[1:])
-            else:
-                # No project specified anywhere: error out — callers must be explicit
-                raise ValueError("project must be specified either as argument or as the top-level folder in path")
-        else:
-            # Project was provided explicitly — interpret the path relative to that project.
-            # If the path redundantly includes the same project prefix (e.g., 'proj/file'), strip it.
-            if len(p.parts) >= 2 and p.parts[0] == project:
-                rest = Path(*p.parts[1:])
-            else:
-                rest = p
+        Parent directories are created only when the first open fails, so writes into
+        existing folders cost no mkdir calls. An existing file keeps its permission
+        bits, and a symlinked task file is written through to its target rather than
+        replaced by a regular file.
+        """
+        target = full_path
+        mode = None
+        try:
+            st = os.lstat(full_path)
+            if stat.S_ISLNK(st.st_mode):
+                target = Path(os.path.realpath(full_path))
+                st = os.stat(target)
+            mode = stat.S_IMODE(st.st_mode)
+        except FileNotFoundError:
+            pass
+
+        tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        try:
+            try:
+                f = open(tmp, 'wb')
+            except FileNotFoundError:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                f = open(tmp, 'wb')
+            with f:
+                f.write(frontmatter.dumps(post).encode('utf-8'))
+            if mode is not None:
+                os.chmod(tmp, mode)
+            os.replace(tmp, target)
+        except BaseException:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            raise
+
+        # The caller keeps its Post (and the metadata objects it passed in); cache a copy
+        cached = frontmatter.Post(post.content, handler=post.handler)
+        cached.metadata.update(copy.deepcopy(post.metadata))
+        self.cache.put(full_path, cached)
+    
+    def _remove_empty_dirs(self, directory: Path) -> None:
+        """Remove `directory` and its ancestors below base_path for as long as they are empty.
 
-        full_path = self.base_path / project / rest
-        relative_posix = full_path.relative_to(self.base_path).as_posix()
-        return full_path, relative_posix
+        `os.rmdir` refuses non-empty directories, so one syscall per level both checks and
+        removes.
+        """
+        base = str(self.base_path)
+        current = str(directory)
+        while current != base and current.startswith(base):
+            try:
+                os.rmdir(current)
+            except OSError:
+                break
+            current = os.path.dirname(current)
     
     def create_task(
         self,
@@ -86,30 +199,42 @@ class TaskManager:
             Dict with task information
         """
         full_path, rel_path = self._resolve_path(project, path)
-
-        # Ensure parent directories exist
-        full_path.parent.mkdir(parents=True, exist_ok=True)
         
         # Create frontmatter document
-        post = frontmatter.Post(content)
+        post = frontmatter.Post(content, handler=_YAML_HANDLER)
         post['title'] = title
-        post['created'] = datetime.now().isoformat()
-        post['updated'] = datetime.now().isoformat()
+        post['created'] = post['updated'] = datetime.now().isoformat()
         
         if metadata:
             post.metadata.update(metadata)
         
-        # Write to file
-        with open(full_path, 'w', encoding='utf-8') as f:
-            f.write(frontmatter.dumps(post))
+        self._write_post(full_path, post)
         
         return {
             'path': rel_path,
             'title': title,
             'created': post['created'],
-            'metadata': post.metadata
+            'metadata': copy.deepcopy(post.metadata)
         }
     
+    def create_tasks(self, specs: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Create several task cards
+        
+        Every path is validated before anything is written, so an invalid entry leaves
+        the tree untouched.
+        
+        Args:
+            specs: Keyword arguments for `create_task`, one dict per task
+        
+        Returns:
+            List of task information dicts, in the order of `specs`
+        """
+        specs = list(specs)
+        for spec in specs:
+            self._resolve_path(spec.get('project'), spec['path'])
+        return [self.create_task(**spec) for spec in specs]
+    
     def read_task(self, path: str, project: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
         Read a task card
@@ -123,17 +248,16 @@ class TaskManager:
         """
         full_path, rel_path = self._resolve_path(project, path)
         
-        if not full_path.exists():
+        try:
+            post = self.cache.get(full_path)
+        except (FileNotFoundError, NotADirectoryError):
             return None
         
-        with open(full_path, 'r', encoding='utf-8') as f:
-            post = frontmatter.load(f)
-        
         return {
             'path': rel_path,
             'title': post.get('title', ''),
             'content': post.content,
-            'metadata': post.metadata
+            'metadata': copy.deepcopy(post.metadata)
         }
     
     def update_task(
@@ -142,7 +266,8 @@ class TaskManager:
         title: Optional[str] = None,
         content: Optional[str] = None,
         metadata: Optional[Dict[str, Any]] = None,
-        project: Optional[str] = None
+        project: Optional[str] = None,
+        add_tags: Optional[List[str]] = None
     ) -> Optional[Dict[str, Any]]:
         """
         Update an existing task card
@@ -153,17 +278,20 @@ class TaskManager:
             title: New title (optional)
             content: New content (optional)
             metadata: Metadata to update (merged with existing)
+            add_tags: Tags to append to the existing ones (duplicates are skipped)
         
         Returns:
             Dict with updated task information or None if not found
         """
         full_path, rel_path = self._resolve_path(project, path)
         
-        if not full_path.exists():
+        # Start from the cached parse (shared, so copy it) instead of re-reading the file
+        try:
+            cached = self.cache.get(full_path)
+        except (FileNotFoundError, NotADirectoryError):
             return None
-        
-        with open(full_path, 'r', encoding='utf-8') as f:
-            post = frontmatter.load(f)
+        post = frontmatter.Post(cached.content, handler=cached.handler)
+        post.metadata.update(cached.metadata)
         
         if title is not None:
             post['title'] = title
@@ -174,16 +302,25 @@ class TaskManager:
         if metadata:
             post.metadata.update(metadata)
         
+        if add_tags:
+            tags = post.metadata.get('tags', [])
+            if isinstance(tags, str):
+                tags = [tags]
+            tags = list(tags)
+            for tag in add_tags:
+                if tag not in tags:
+                    tags.append(tag)
+            post['tags'] = tags
+        
         post['updated'] = datetime.now().isoformat()
         
-        with open(full_path, 'w', encoding='utf-8') as f:
-            f.write(frontmatter.dumps(post))
+        self._write_post(full_path, post)
         
         return {
             'path': rel_path,
             'title': post.get('title', ''),
             'content': post.content,
-            'metadata': post.metadata
+            'metadata': copy.deepcopy(post.metadata)
         }
     
     def delete_task(self, path: str, project: Optional[str] = None) -> bool:
@@ -199,41 +336,19 @@ class TaskManager:
         """
         full_path, rel_path = self._resolve_path(project, path)
         
-        if not full_path.exists():
+        try:
+            full_path.unlink()
+        except (FileNotFoundError, NotADirectoryError):
             return False
-        
-        full_path.unlink()
+        self.cache.discard(full_path)
         
         # Clean up empty parent directories
-        try:
-            parent = full_path.parent
-            while parent != self.base_path and not any(parent.iterdir()):
-                parent.rmdir()
-                parent = parent.parent
-        except Exception:
-            pass
+        self._remove_empty_dirs(full_path.parent)
         
         return True
     
-    def list_tasks(
-        self,
-        subpath: str = "",
-        recursive: bool = True,
-        include_content: bool = False,
-        project: Optional[str] = None
-    ) -> List[Dict[str, Any]]:
-        """
-        List all tasks in a directory
-        
-        Args:
-            subpath: Subdirectory within project or a project name when `project` is omitted
-            recursive: Include subdirectories
-            include_content: Include full content in results (token-expensive)
-            project: Optional project name to scope the listing
-        
-        Returns:
-            List of task dictionaries
-        """
+    def _list_root(self, subpath: str, project: Optional[str]) -> Optional[Path]:
+        """Resolve the directory scanned by `list_tasks`, or None if it does not exist"""
         # Resolve search path based on project and subpath
         if subpath:
             sp = Path(subpath)
@@ -256,31 +371,124 @@ class TaskManager:
             search_path = self.base_path / project / sub
 
         if not search_path.exists():
+            return None
+        return search_path
+
+    def list_tasks(
+        self,
+        subpath: str = "",
+        recursive: bool = True,
+        include_content: bool = False,
+        project: Optional[str] = None,
+        preview_chars: Optional[int] = None,
+        fields: Optional[Iterable[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        List all tasks in a directory
+        
+        Args:
+            subpath: Subdirectory within project or a project name when `project` is omitted
+            recursive: Include subdirectories
+            include_content: Include full content in results (token-expensive)
+            project: Optional project name to scope the listing
+            preview_chars: With `include_content`, only read and return the first
+                           `preview_chars` characters of each task body
+            fields: Only return these keys of each task dict ('path', 'title', 'metadata',
+                    'content'). With just 'path' the files are never opened, so tasks
+                    that would fail to parse are listed too
+        
+        Returns:
+            List of task dictionaries
+        """
+        search_path = self._list_root(subpath, project)
+        if search_path is None:
             return []
 
-        pattern = "**/*.md" if recursive else "*.md"
-        tasks = []
+        # Walked paths start with base_path, so relative paths are plain slices
+        skip = len(str(self.base_path)) + 1
+
+        if fields is not None:
+            fields = frozenset(fields)
+            if not fields & {'title', 'metadata', 'content'}:
+                return [
+                    {'path': entry.path[skip:].replace(os.sep, '/')} if 'path' in fields else {}
+                    for entry in _iter_md_entries(search_path, recursive)
+                ]
+            include_content = include_content and 'content' in fields
 
-        for md_file in search_path.glob(pattern):
+        def load(entry: os.DirEntry) -> Optional[Dict[str, Any]]:
             try:
-                with open(md_file, 'r', encoding='utf-8') as f:
-                    post = frontmatter.load(f)
+                if include_content and preview_chars is not None:
+                    post = _load_post(entry.path, preview_chars)
+                else:
+                    post = self.cache.get(entry.path, header_only=not include_content, st=entry.stat())
+            except Exception:
+                # Skip files that can't be parsed
+                return None
+
+            task_info = {
+                'path': entry.path[skip:].replace(os.sep, '/'),
+                'title': post.get('title', ''),
+                'metadata': copy.deepcopy(post.metadata)
+            }
+
+            if include_content:
+                task_info['content'] = post.content
 
-                task_info = {
-                    'path': md_file.relative_to(self.base_path).as_posix(),
-                    'title': post.get('title', ''),
-                    'metadata': post.metadata
-                }
+            if fields is not None:
+                return {key: value for key, value in task_info.items() if key in fields}
+            return task_info
+
+        entries = _iter_md_entries(search_path, recursive)
+        if self.max_workers > 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                loaded = list(pool.map(load, list(entries)))
+        else:
+            loaded = map(load, entries)
 
-                if include_content:
-                    task_info['content'] = post.content
+        tasks = [task for task in loaded if task is not None]
 
-                tasks.append(task_info)
-            except Exception as e:
+        return tasks
+    
+    def list_task_summaries(
+        self,
+        subpath: str = "",
+        recursive: bool = True,
+        project: Optional[str] = None
+    ) -> List[TaskSummary]:
+        """
+        List tasks as compact `TaskSummary` records (no content, only the common metadata)
+        
+        Accepts the same arguments as `list_tasks`.
+        
+        Returns:
+            List of TaskSummary tuples
+        """
+        search_path = self._list_root(subpath, project)
+        if search_path is None:
+            return []
+
+        summaries = []
+        skip = len(str(self.base_path)) + 1
+
+        for entry in _iter_md_entries(search_path, recursive):
+            try:
+                post = self.cache.get(entry.path, header_only=True, st=entry.stat())
+            except Exception:
                 # Skip files that can't be parsed
                 continue
 
-        return tasks
+            metadata = post.metadata
+            tags = metadata.get('tags', ())
+            summaries.append(TaskSummary(
+                path=entry.path[skip:].replace(os.sep, '/'),
+                title=metadata.get('title', ''),
+                status=metadata.get('status'),
+                priority=metadata.get('priority'),
+                tags=(tags,) if isinstance(tags, str) else tuple(tags or ()),
+            ))
+
+        return summaries
     
     def get_structure(self, subpath: str = "", project: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -311,7 +519,7 @@ class TaskManager:
 
         # Validate relative path usage
         if any(part == ".." for part in sub.parts):
-            raise ValueError("path must not contain parent references")
+            raise ProjectResolutionError("path must not contain parent references")
 
         if project is None:
             search_path = self.base_path
@@ -319,41 +527,43 @@ class TaskManager:
             search_path = self.base_path / project / sub
 
         if project is not None and not search_path.exists():
-            # Signal a project resolution failure to callers (CLI / MCP handlers expect ValueError)
-            raise ValueError(f"project '{project}' not found")
-
-        def build_tree(path: Path) -> Dict[str, Any]:
-            tree = {
-                'type': 'directory',
-                'name': path.name or 'root',
-                'children': []
-            }
-            
+            # Signal a project resolution failure to callers (CLI / MCP handlers catch it)
+            raise ProjectResolutionError(f"project '{project}' not found")
+
+        root = {'type': 'directory', 'name': search_path.name or 'root', 'children': []}
+        skip = len(str(self.base_path)) + 1
+        # Iterative walk: each directory's node is created when its parent is listed and
+        # filled in when popped, so sibling order follows the sorted listing
+        stack = [(str(search_path), root)]
+        while stack:
+            dir_path, tree = stack.pop()
             try:
-                for item in sorted(path.iterdir()):
-                    if item.is_dir():
-                        tree['children'].append(build_tree(item))
-                    elif item.suffix == '.md':
-                        try:
-                            with open(item, 'r', encoding='utf-8') as f:
-                                post = frontmatter.load(f)
-                            
-                            tree['children'].append({
-                                'type': 'task',
-                                'name': item.name,
-                                'path': item.relative_to(self.base_path).as_posix(),
-                                'title': post.get('title', ''),
-                                'metadata': {k: v for k, v in post.metadata.items() 
-                                           if k in ['status', 'priority', 'tags']}
-                            })
-                        except Exception:
-                            continue
-            except Exception:
-                pass
-            
-            return tree
-        
-        return build_tree(search_path)
+                with os.scandir(dir_path) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+            except OSError:
+                continue
+
+            append = tree['children'].append
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    node = {'type': 'directory', 'name': entry.name, 'children': []}
+                    append(node)
+                    stack.append((entry.path, node))
+                elif entry.name.endswith('.md'):
+                    try:
+                        post = self.cache.get(entry.path, header_only=True, st=entry.stat())
+                    except Exception:
+                        continue
+                    append({
+                        'type': 'task',
+                        'name': entry.name,
+                        'path': entry.path[skip:].replace(os.sep, '/'),
+                        'title': post.get('title', ''),
+                        'metadata': copy.deepcopy({k: v for k, v in post.metadata.items()
+                                                   if k in ['status', 'priority', 'tags']})
+                    })
+
+        return root
     
     def move_task(self, old_path: str, new_path: str, project: Optional[str] = None) -> bool:
         """
@@ -370,19 +580,30 @@ class TaskManager:
         old_full, old_rel = self._resolve_path(project, old_path)
         new_full, new_rel = self._resolve_path(project, new_path)
         
-        if not old_full.exists() or new_full.exists():
+        # Hard-link then unlink: the link refuses to overwrite an existing destination,
+        # so no exists() checks (and the race between them and the move) are needed
+        try:
+            try:
+                os.link(old_full, new_full)
+            except FileNotFoundError:
+                if not old_full.exists():
+                    return False
+                # Destination folder does not exist yet
+                new_full.parent.mkdir(parents=True, exist_ok=True)
+                os.link(old_full, new_full)
+        except FileExistsError:
             return False
-        
-        new_full.parent.mkdir(parents=True, exist_ok=True)
-        old_full.rename(new_full)
+        except OSError:
+            # No hard links here (e.g. FAT, directories): check, then rename
+            if not old_full.exists() or new_full.exists():
+                return False
+            new_full.parent.mkdir(parents=True, exist_ok=True)
+            old_full.rename(new_full)
+        else:
+            old_full.unlink()
+        self.cache.rename(old_full, new_full)
         
         # Clean up empty parent directories
-        try:
-            parent = old_full.parent
-            while parent != self.base_path and not any(parent.iterdir()):
-                parent.rmdir()
-                parent = parent.parent
-        except Exception:
-            pass
+        self._remove_empty_dirs(old_full.parent)
         
         return True
@@ -1,7 +1,10 @@
 """
 Utilities for TaskMaster shared by CLI and MCP adapters
 """
-from typing import Any
+
+
+class ProjectResolutionError(ValueError):
+    """A task path or project could not be resolved (missing project, absolute path, '..')"""
 
 
 def project_resolution_error_msg(exc: Exception) -> str:
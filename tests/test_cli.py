@@ -1,6 +1,4 @@
 import os
-import tempfile
-import shutil
 from click.testing import CliRunner
 import pytest
 
@@ -10,10 +8,8 @@ from taskmaster import __version__
 
 
 @pytest.fixture
-def temp_tasks_dir():
-    temp_dir = tempfile.mkdtemp()
-    yield temp_dir
-    shutil.rmtree(temp_dir)
+def temp_tasks_dir(tmp_path):
+    return str(tmp_path)
 
 
 def test_create_requires_project_when_missing(temp_tasks_dir):
@@ -23,6 +19,17 @@ def test_create_requires_project_when_missing(temp_tasks_dir):
     assert 'Provide a project' in result.output
 
 
+def test_other_value_errors_are_not_reported_as_project_errors(temp_tasks_dir, monkeypatch):
+    def broken(*args, **kwargs):
+        raise ValueError("index is corrupt")
+
+    monkeypatch.setattr(TaskManager, 'list_tasks', broken)
+    runner = CliRunner()
+    result = runner.invoke(main, ['--tasks-dir', temp_tasks_dir, 'list', '--full'])
+    assert isinstance(result.exception, ValueError)
+    assert 'Provide a project' not in result.output
+
+
 def test_create_with_project_flag(temp_tasks_dir):
     runner = CliRunner()
     res = runner.invoke(main, ['--tasks-dir', temp_tasks_dir, 'create', '--project', 'cli', 'task1.md', 'Title'])
@@ -66,3 +73,69 @@ def test_cli_version():
     res = runner.invoke(main, ['--version'])
     assert res.exit_code == 0
     assert __version__ in res.output
+
+
+def test_context_builds_components_lazily(temp_tasks_dir):
+    from taskmaster.cli import _LazyObj
+
+    obj = _LazyObj(tasks_dir=temp_tasks_dir)
+    assert 'manager' not in obj and 'searcher' not in obj
+
+    manager = obj['manager']
+    assert isinstance(manager, TaskManager)
+    assert obj['manager'] is manager
+    assert 'searcher' not in obj
+
+
+def test_list_and_tree_output(temp_tasks_dir):
+    runner = CliRunner()
+    manager = TaskManager(temp_tasks_dir)
+    manager.create_task('a.md', 'Alpha', metadata={'status': 'open'}, project='out')
+    manager.create_task('sub/b.md', 'Beta', project='out')
+
+    res = runner.invoke(main, ['--tasks-dir', temp_tasks_dir, 'list', '--project', 'out'])
+    assert res.exit_code == 0
+    assert res.output.startswith('Found 2 task(s):\n\n')
+    assert '• out/a.md\n  Alpha\n  Status: open\n' in res.output
+
+    res = runner.invoke(main, ['--tasks-dir', temp_tasks_dir, 'tree', '--project', 'out'])
+    assert res.exit_code == 0
+    assert res.output.splitlines()[0] == '└── out'
+    assert '├── a.md' in res.output
+    assert 'Beta' in res.output
+
+
+def test_update_add_tag(temp_tasks_dir):
+    runner = CliRunner()
+    manager = TaskManager(temp_tasks_dir)
+    manager.create_task('task1.md', 'Title', metadata={'tags': ['one']}, project='upd')
+
+    res = runner.invoke(main, ['--tasks-dir', temp_tasks_dir, 'update', '--project', 'upd',
+                               'task1.md', '--add-tag', 'two'])
+    assert res.exit_code == 0
+    assert manager.read_task('task1.md', project='upd')['metadata']['tags'] == ['one', 'two']
+
+
+def test_create_with_tags(temp_tasks_dir):
+    runner = CliRunner()
+    res = runner.invoke(main, ['--tasks-dir', temp_tasks_dir, 'create', '--project', 'tg',
+                               'task1.md', 'Title', '--tags', 'a', '--tags', 'b'])
+    assert res.exit_code == 0
+
+    manager = TaskManager(temp_tasks_dir)
+    assert manager.read_task('task1.md', project='tg')['metadata']['tags'] == ['a', 'b']
+
+
+def test_search_with_filters(temp_tasks_dir):
+    runner = CliRunner()
+    manager = TaskManager(temp_tasks_dir)
+    manager.create_task('a.md', 'Alpha', metadata={'status': 'open', 'tags': ['x']}, project='sr')
+    manager.create_task('b.md', 'Beta', metadata={'status': 'done', 'tags': ['y']}, project='sr')
+
+    res = runner.invoke(main, ['--tasks-dir', temp_tasks_dir, 'search', '--status', 'open'])
+    assert res.exit_code == 0
+    assert 'Alpha' in res.output and 'Beta' not in res.output
+
+    res = runner.invoke(main, ['--tasks-dir', temp_tasks_dir, 'search', '--tags', 'y'])
+    assert res.exit_code == 0
+    assert 'Beta' in res.output and 'Alpha' not in res.output
@@ -1,6 +1,4 @@
 import os
-import tempfile
-import shutil
 import asyncio
 
 from mcp.types import TextContent
@@ -63,3 +61,150 @@ def test_mcp_move_with_project(tmp_path):
 
 
 
+
+
+def test_mcp_list_tools_is_cached():
+    from taskmaster.mcp_server import list_tools
+
+    tools = asyncio.run(list_tools())
+    assert "create_task" in {t.name for t in tools}
+    assert asyncio.run(list_tools()) is tools
+
+
+def test_mcp_unknown_tool():
+    result = asyncio.run(call_tool("no_such_tool", {}))
+    assert result[0].text == "Unknown tool: no_such_tool"
+
+
+def test_mcp_list_tasks(tmp_path):
+    task_manager.base_path = TaskManager(str(tmp_path)).base_path
+
+    manager = TaskManager(str(tmp_path))
+    manager.create_task('task1.md', 'Listed', metadata={'status': 'open'}, project='ls')
+
+    res = asyncio.run(call_tool("list_tasks", {"project": "ls"}))
+    assert "Found 1 tasks" in res[0].text
+    assert "• [open] Listed" in res[0].text
+
+
+def test_mcp_batch_execute(tmp_path):
+    task_manager.base_path = TaskManager(str(tmp_path)).base_path
+
+    manager = TaskManager(str(tmp_path))
+    manager.create_task('task1.md', 'Batched', project='bt')
+
+    res = asyncio.run(call_tool("batch_execute", {"calls": [
+        {"name": "read_task", "arguments": {"path": "task1.md", "project": "bt"}},
+        {"name": "list_tasks", "arguments": {"project": "bt"}},
+        {"name": "no_such_tool"},
+    ]}))
+    assert len(res) == 1
+    text = res[0].text
+    assert "### [1] read_task\n**Batched**" in text
+    assert "### [2] list_tasks\nFound 1 tasks" in text
+    assert "### [3] no_such_tool\nUnknown tool: no_such_tool" in text
+
+
+def test_mcp_batch_execute_stop_on_error(tmp_path):
+    task_manager.base_path = TaskManager(str(tmp_path)).base_path
+
+    res = asyncio.run(call_tool("batch_execute", {"maxConcurrent": 1, "stopOnError": True, "calls": [
+        {"name": "read_task", "arguments": {}},
+        {"name": "list_tasks", "arguments": {}},
+    ]}))
+    text = res[0].text
+    assert "### [1] read_task\nInput validation error: 'path' is a required property" in text
+    assert "### [2] list_tasks\nSkipped" in text
+
+
+def test_mcp_batch_execute_stop_on_error_keeps_earlier_calls(tmp_path):
+    task_manager.base_path = TaskManager(str(tmp_path)).base_path
+
+    manager = TaskManager(str(tmp_path))
+    manager.create_task('task1.md', 'Kept', project='so')
+
+    res = asyncio.run(call_tool("batch_execute", {"maxConcurrent": 1, "stopOnError": True, "calls": [
+        {"name": "list_tasks", "arguments": {"project": "so"}},
+        {"name": "list_tasks", "arguments": {"project": "so"}},
+        {"name": "read_task", "arguments": {"path": "missing.md", "project": "so"}},
+        {"name": "nope"},
+    ]}))
+    text = res[0].text
+    assert "### [2] list_tasks\nFound 1 tasks" in text
+    assert "### [3] read_task\n✗ Task not found" in text
+    assert "### [4] nope\nSkipped" in text
+
+
+def test_mcp_read_and_structure_output(tmp_path):
+    task_manager.base_path = TaskManager(str(tmp_path)).base_path
+
+    manager = TaskManager(str(tmp_path))
+    manager.create_task('task1.md', 'Top', content='Body', metadata={'status': 'open'}, project='fmt')
+    manager.create_task('sub/task2.md', 'Nested', metadata={'status': 'done'}, project='fmt')
+
+    res = asyncio.run(call_tool("read_task", {"path": "task1.md", "project": "fmt"}))
+    text = res[0].text
+    assert text.startswith("**Top**\n\nPath: fmt/task1.md\n\nStatus: open\n")
+    assert text.endswith("\n---\n\nBody")
+
+    res = asyncio.run(call_tool("get_structure", {"project": "fmt"}))
+    assert res[0].text == (
+        "📁 fmt\n"
+        "  📁 sub\n"
+        "    📄 Nested [done]\n"
+        "  📄 Top [open]\n"
+    )
+
+
+def test_mcp_rejects_invalid_arguments():
+    result = asyncio.run(call_tool("create_task", {"path": "proj/task1.md"}))
+    assert result[0].text == "Input validation error: 'title' is a required property"
+
+
+def test_mcp_json_format(tmp_path):
+    import json
+
+    task_manager.base_path = TaskManager(str(tmp_path)).base_path
+    task_searcher.base_path = TaskSearcher(str(tmp_path)).base_path
+
+    manager = TaskManager(str(tmp_path))
+    manager.create_task('task1.md', 'Jsonable', content='find me', metadata={'status': 'open'}, project='js')
+
+    res = asyncio.run(call_tool("list_tasks", {"project": "js", "format": "json"}))
+    assert json.loads(res[0].text) == [
+        {"path": "js/task1.md", "title": "Jsonable", "status": "open", "priority": None}
+    ]
+
+    res = asyncio.run(call_tool("search_tasks", {"query": "find", "format": "json"}))
+    assert json.loads(res[0].text) == [
+        {"path": "js/task1.md", "title": "Jsonable", "score": 1, "snippet": "find me"}
+    ]
+
+    res = asyncio.run(call_tool("get_structure", {"project": "js", "format": "json"}))
+    assert json.loads(res[0].text)['children'][0]['title'] == "Jsonable"
+
+
+def test_mcp_list_tasks_chunked(tmp_path):
+    task_manager.base_path = TaskManager(str(tmp_path)).base_path
+
+    manager = TaskManager(str(tmp_path))
+    for i in range(120):
+        manager.create_task(f'task{i}.md', f'Task {i}', project='chunk')
+
+    res = asyncio.run(call_tool("list_tasks", {"project": "chunk"}))
+    assert len(res) == 3
+    assert res[0].text.startswith("Found 120 tasks:")
+    assert "".join(r.text for r in res).count("• [unknown]") == 120
+
+
+def test_mcp_managers_created_lazily(monkeypatch):
+    import importlib
+    import taskmaster.mcp_server as mcp_server
+
+    monkeypatch.setattr(mcp_server, "_task_manager", None)
+    monkeypatch.setattr(mcp_server, "_task_searcher", None)
+    assert "task_manager" not in vars(mcp_server)
+
+    manager = importlib.import_module("taskmaster.mcp_server").task_manager
+    assert manager is mcp_server._task_manager
+    assert mcp_server.task_searcher is mcp_server._task_searcher
@@ -3,8 +3,6 @@ Basic tests for TaskMaster functionality
 """
 
 import os
-import tempfile
-import shutil
 from pathlib import Path
 import pytest
 
@@ -13,11 +11,27 @@ from taskmaster.search import TaskSearcher
 
 
 @pytest.fixture
-def temp_tasks_dir():
-    """Create a temporary directory for tests"""
-    temp_dir = tempfile.mkdtemp()
-    yield temp_dir
-    shutil.rmtree(temp_dir)
+def temp_tasks_dir(tmp_path_factory):
+    """Create a temporary directory for tests (pytest prunes old session roots)"""
+    return str(tmp_path_factory.mktemp("tasks"))
+
+
+@pytest.fixture
+def load_post_calls(monkeypatch):
+    """Record every task file parse as (file name, body_chars), through the cache or the index"""
+    import taskmaster.cache as cache_module
+    import taskmaster.index as index_module
+
+    calls = []
+    original = cache_module._load_post
+
+    def recording(md_file, body_chars=None):
+        calls.append((Path(md_file).name, body_chars))
+        return original(md_file, body_chars)
+
+    monkeypatch.setattr(cache_module, "_load_post", recording)
+    monkeypatch.setattr(index_module, "_load_post", recording)
+    return calls
 
 
 def test_create_task(temp_tasks_dir):
@@ -103,9 +117,11 @@ def test_list_tasks(temp_tasks_dir):
     manager = TaskManager(temp_tasks_dir)
     
     # Create multiple tasks
-    manager.create_task("test/task1.md", "Task 1")
-    manager.create_task("test/task2.md", "Task 2")
-    manager.create_task("other/task3.md", "Task 3")
+    manager.create_tasks([
+        {"path": "test/task1.md", "title": "Task 1"},
+        {"path": "test/task2.md", "title": "Task 2"},
+        {"path": "other/task3.md", "title": "Task 3"},
+    ])
     
     # List all tasks
     tasks = manager.list_tasks()
@@ -220,9 +236,11 @@ def test_get_structure(temp_tasks_dir):
     manager = TaskManager(temp_tasks_dir)
     
     # Create tasks in hierarchy
-    manager.create_task("project1/task1.md", "Task 1")
-    manager.create_task("project1/subtasks/task2.md", "Task 2")
-    manager.create_task("project2/task3.md", "Task 3")
+    manager.create_tasks([
+        {"path": "project1/task1.md", "title": "Task 1"},
+        {"path": "project1/subtasks/task2.md", "title": "Task 2"},
+        {"path": "project2/task3.md", "title": "Task 3"},
+    ])
     
     # Get structure
     structure = manager.get_structure()
@@ -314,12 +332,22 @@ def test_get_all_tags_project_not_found_returns_empty(temp_tasks_dir):
     assert tags == set()
 
 
-def test_requires_project_when_missing(temp_tasks_dir):
+@pytest.mark.parametrize("op,args,kwargs", [
+    ("create_task", ("task1.md", "No project"), {}),
+    ("read_task", ("task1.md",), {}),
+    ("update_task", ("task1.md",), {"title": "Y"}),
+    ("delete_task", ("task1.md",), {}),
+    ("move_task", ("task1.md", "project1/t.md"), {}),
+    ("move_task", ("project1/task1.md", "t.md"), {}),
+])
+def test_requires_project_when_missing(temp_tasks_dir, op, args, kwargs):
     """Operations without a project and without a leading project in the path should fail"""
     manager = TaskManager(temp_tasks_dir)
+    manager.create_task("project1/task1.md", "Existing")
 
-    with pytest.raises(ValueError):
-        manager.create_task("task1.md", "No project")
+    with pytest.raises(ValueError, match=r"(?i)top-level folder"):
+        getattr(manager, op)(*args, **kwargs)
+    assert manager.read_task("project1/task1.md")['title'] == "Existing"
 
 
 def test_project_param_project_prefix_ignored(temp_tasks_dir):
@@ -383,3 +411,745 @@ def test_paths_are_posix(temp_tasks_dir):
 
     for p in collect_paths(structure):
         assert '/' in p and '\\' not in p
+
+
+def test_list_tasks_content_preview(temp_tasks_dir):
+    """preview_chars should truncate listed content without touching metadata"""
+    manager = TaskManager(temp_tasks_dir)
+
+    manager.create_task("prev/task1.md", "Long", content="x" * 500, metadata={"status": "open"})
+
+    tasks = manager.list_tasks(project="prev", include_content=True, preview_chars=50)
+    assert len(tasks) == 1
+    assert tasks[0]['content'] == "x" * 50
+    assert tasks[0]['title'] == "Long"
+    assert tasks[0]['metadata']['status'] == "open"
+
+    full = manager.list_tasks(project="prev", include_content=True)
+    assert full[0]['content'] == "x" * 500
+
+
+# Valid task files whose frontmatter is not a `---` block on the first line
+_OTHER_HEADERS = {
+    "json.md": '{\n"title": "Json", "status": "open", "tags": ["j"]\n}\n\n' + "y" * 100,
+    "blank.md": "\n---\ntitle: Blank\nstatus: open\ntags: [b]\n---\n" + "y" * 100,
+}
+
+
+def _write_other_headers(directory):
+    os.makedirs(directory, exist_ok=True)
+    for name, text in _OTHER_HEADERS.items():
+        with open(os.path.join(directory, name), "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+def test_list_tasks_preview_other_frontmatter(temp_tasks_dir):
+    """Previews of JSON frontmatter or a header after blank lines match the full parse"""
+    _write_other_headers(os.path.join(temp_tasks_dir, "oh"))
+    manager = TaskManager(temp_tasks_dir)
+
+    tasks = manager.list_tasks(project="oh", include_content=True, preview_chars=10)
+    assert sorted(t['title'] for t in tasks) == ["Blank", "Json"]
+    for task in tasks:
+        assert task['metadata']['status'] == "open"
+        assert task['content'] == "y" * 10
+
+
+def test_search_and_index_see_other_frontmatter(temp_tasks_dir):
+    """Header-only reads (search filters, tags, structure, index) parse other formats in full"""
+    from taskmaster.cache import FrontmatterCache
+    from taskmaster.index import TaskIndex
+
+    _write_other_headers(os.path.join(temp_tasks_dir, "oh"))
+    searcher = TaskSearcher(temp_tasks_dir, cache=FrontmatterCache())
+
+    assert sorted(r['title'] for r in searcher.search(metadata_filters={"status": "open"})) == ["Blank", "Json"]
+    assert [r['title'] for r in searcher.search_by_tags(["j"])] == ["Json"]
+    assert searcher.get_all_tags() == {"j", "b"}
+
+    manager = TaskManager(temp_tasks_dir, cache=FrontmatterCache())
+    assert all(t['metadata']['status'] == "open" for t in manager.list_tasks(project="oh"))
+    tasks = manager.get_structure(project="oh")['children']
+    assert sorted(t['metadata']['tags'][0] for t in tasks) == ["b", "j"]
+
+    # The persisted records hold the parsed metadata too
+    index = TaskIndex(Path(temp_tasks_dir), cache=FrontmatterCache())
+    assert index.lookup({"status": "open"}) == {"oh/json.md", "oh/blank.md"}
+
+
+def test_header_fast_path_closes_block_like_frontmatter(temp_tasks_dir):
+    """The direct YAML read ends the block at the same delimiter frontmatter splits on"""
+    from taskmaster.cache import _load_post
+
+    path = os.path.join(temp_tasks_dir, "dashes.md")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("---\ntitle: Dashes\n----\nBody\n\n---\n\nAfter a rule\n")
+
+    assert _load_post(path, 0).metadata == _load_post(path).metadata == {"title": "Dashes"}
+    assert _load_post(path, 4).content == "Body"
+
+
+def test_directories_named_md_are_walked(temp_tasks_dir):
+    """Tasks inside a folder whose name ends in `.md` are listed, searched and indexed"""
+    manager = TaskManager(temp_tasks_dir)
+    manager.create_task("q/dir.md/inner.md", "Inner", content="needle", metadata={"tags": ["in"]})
+
+    assert [t['path'] for t in manager.list_tasks("q")] == ["q/dir.md/inner.md"]
+    assert [t.path for t in manager.list_task_summaries("q")] == ["q/dir.md/inner.md"]
+    assert manager.list_tasks("q", recursive=False) == []
+
+    searcher = TaskSearcher(temp_tasks_dir)
+    assert [r['path'] for r in searcher.search(query="needle")] == ["q/dir.md/inner.md"]
+    assert searcher.get_all_tags() == {"in"}
+
+
+def test_search_cache_invalidated_by_changes(temp_tasks_dir, monkeypatch):
+    """Cached searches must reflect files created or edited after the first query"""
+    import asyncio
+
+    manager = TaskManager(temp_tasks_dir)
+    searcher = TaskSearcher(temp_tasks_dir, cache_size=8)
+
+    manager.create_task("cache/task1.md", "Cache One", content="needle")
+    first = searcher.search(query="needle")
+    assert len(first) == 1
+
+    # Repeats are answered from the result cache, each with its own copy
+    with monkeypatch.context() as m:
+        m.setattr(searcher, "_search", None)
+        m.setattr(searcher, "_candidate_files", None)
+        first[0]['metadata'].clear()
+        first.clear()
+        second = searcher.search(query="needle")
+        assert second == asyncio.run(searcher.search_async(query="needle"))
+        assert [r['title'] for r in second] == ["Cache One"]
+        second.clear()
+        assert len(searcher.search(query="needle")) == 1
+
+    manager.create_task("cache/task2.md", "Cache Two", content="needle needle")
+    assert len(searcher.search(query="needle")) == 2
+
+    manager.update_task("cache/task1.md", content="haystack")
+    assert len(searcher.search(query="needle")) == 1
+
+
+def test_update_task_add_tags(temp_tasks_dir):
+    """add_tags should merge with existing tags in a single update"""
+    manager = TaskManager(temp_tasks_dir)
+
+    manager.create_task("tags/task1.md", "Tagged", metadata={"tags": "backend"})
+
+    result = manager.update_task("tags/task1.md", add_tags=["api", "backend"])
+    assert result['metadata']['tags'] == ["backend", "api"]
+
+    assert manager.update_task("tags/missing.md", add_tags=["x"]) is None
+
+
+def test_returned_metadata_does_not_alias_cache(temp_tasks_dir):
+    """Mutating nested metadata in a result leaves the cached task untouched"""
+    manager = TaskManager(temp_tasks_dir)
+
+    manager.create_task("al/task1.md", "Aliased", metadata={"tags": ["one"]})["metadata"]["tags"].append("x")
+    manager.read_task("al/task1.md")["metadata"]["tags"].append("y")
+    manager.update_task("al/task1.md", title="Renamed")["metadata"]["tags"].append("z")
+    manager.list_tasks("al")[0]["metadata"]["tags"].append("w")
+
+    assert manager.read_task("al/task1.md")["metadata"]["tags"] == ["one"]
+
+
+def test_write_caches_a_copy_of_caller_metadata(temp_tasks_dir):
+    """Objects passed to create_task are not shared with the cached task"""
+    manager = TaskManager(temp_tasks_dir)
+    tags = ["one"]
+
+    manager.create_task("wc/task1.md", "Copied", metadata={"tags": tags})
+    tags.append("later")
+
+    assert manager.read_task("wc/task1.md")["metadata"]["tags"] == ["one"]
+
+
+def test_search_results_do_not_share_metadata(temp_tasks_dir):
+    """Mutating one search result's metadata does not leak into later results"""
+    manager = TaskManager(temp_tasks_dir)
+    manager.create_task("sr/task1.md", "Shared", metadata={"status": "open", "tags": ["one"]})
+    searcher = TaskSearcher(temp_tasks_dir)
+
+    searcher.search(metadata_filters={"status": "open"})[0]["metadata"]["tags"].append("x")
+    searcher.search(query="shared")[0]["metadata"]["tags"].append("y")
+    searcher.search_by_tags(["one"])[0]["metadata"]["tags"].append("z")
+
+    assert searcher.search(metadata_filters={"status": "open"})[0]["metadata"]["tags"] == ["one"]
+    assert searcher.search_by_tags(["one"])[0]["metadata"]["tags"] == ["one"]
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX permissions and symlinks")
+def test_update_keeps_file_mode_and_symlink(temp_tasks_dir):
+    """Atomic rewrites keep the file's permission bits and write through symlinks"""
+    manager = TaskManager(temp_tasks_dir)
+    manager.create_task("fm/real.md", "Real")
+    real = os.path.join(temp_tasks_dir, "fm", "real.md")
+    link = os.path.join(temp_tasks_dir, "fm", "link.md")
+    os.chmod(real, 0o600)
+    os.symlink("real.md", link)
+
+    manager.update_task("fm/link.md", title="Through link")
+
+    assert os.path.islink(link)
+    assert os.stat(real).st_mode & 0o777 == 0o600
+    assert manager.read_task("fm/real.md")["title"] == "Through link"
+
+
+def test_tags_cache_invalidated_by_changes(temp_tasks_dir):
+    """Tag sets answered from the index must reflect later edits"""
+    manager = TaskManager(temp_tasks_dir)
+    searcher = TaskSearcher(temp_tasks_dir)
+
+    manager.create_task("task1.md", "One", metadata={"tags": ["a"]}, project="tc")
+    assert searcher.get_all_tags(project="tc") == {"a"}
+    assert searcher.get_all_tags(project="tc") == {"a"}
+
+    manager.update_task("task1.md", add_tags=["b"], project="tc")
+    assert searcher.get_all_tags(project="tc") == {"a", "b"}
+    assert searcher.get_all_tags(project="missing") == set()
+
+
+def test_search_iter_is_lazy(temp_tasks_dir):
+    """search_iter should yield matches one at a time"""
+    manager = TaskManager(temp_tasks_dir)
+    searcher = TaskSearcher(temp_tasks_dir)
+
+    for i in range(3):
+        manager.create_task(f"lazy/task{i}.md", f"Task {i}", content="match")
+
+    it = searcher.search_iter(query="match")
+    first = next(it)
+    assert first['score'] == 1
+    assert first['snippet'] == "match"
+    assert len(list(it)) == 2
+
+
+def test_list_task_summaries(temp_tasks_dir):
+    """Summaries should carry the common metadata fields"""
+    manager = TaskManager(temp_tasks_dir)
+
+    manager.create_task("sum/task1.md", "One", metadata={"status": "open", "tags": "solo"})
+    manager.create_task("sum/sub/task2.md", "Two", metadata={"priority": "high", "tags": ["a", "b"]})
+
+    summaries = sorted(manager.list_task_summaries(project="sum"))
+    assert [s.path for s in summaries] == ["sum/sub/task2.md", "sum/task1.md"]
+    assert summaries[0].priority == "high" and summaries[0].status is None
+    assert summaries[0].tags == ("a", "b")
+    assert summaries[1].tags == ("solo",)
+
+    assert manager.list_task_summaries(project="sum", recursive=False)[0].title == "One"
+    assert manager.list_task_summaries(project="missing") == []
+
+
+def test_metadata_index_persisted_and_refreshed(temp_tasks_dir, load_post_calls):
+    """Filtered searches use the persisted index and only re-index changed files"""
+    import taskmaster.index as index_module
+
+    manager = TaskManager(temp_tasks_dir)
+    manager.create_task("idx/task1.md", "One", metadata={"status": "open", "tags": ["a"]})
+    manager.create_task("idx/task2.md", "Two", metadata={"status": "done", "tags": ["a", "b"]})
+
+    searcher = TaskSearcher(temp_tasks_dir)
+    assert [r['title'] for r in searcher.search(metadata_filters={"status": "open"})] == ["One"]
+    assert (Path(temp_tasks_dir) / index_module.INDEX_FILE).exists()
+
+    load_post_calls.clear()
+    manager.update_task("idx/task1.md", metadata={"status": "done"})
+    fresh = TaskSearcher(temp_tasks_dir)
+    fresh.index.lookup({})
+    assert load_post_calls == [("task1.md", 0)]
+    assert len(fresh.search(metadata_filters={"status": "done"})) == 2
+
+    assert len(fresh.search_by_tags(["a", "b"], match_all=True)) == 1
+    assert len(fresh.search_by_tags(["b", "c"])) == 1
+
+
+def test_search_parse_cache_tracks_edits(temp_tasks_dir):
+    """Cached parses must be refreshed when a file changes on disk"""
+    manager = TaskManager(temp_tasks_dir)
+    searcher = TaskSearcher(temp_tasks_dir)
+
+    manager.create_task("pc/task1.md", "Cached", content="old words")
+    assert len(searcher.search(query="old")) == 1
+
+    manager.update_task("pc/task1.md", content="new words")
+    assert searcher.search(query="old") == []
+    assert len(searcher.search(query="new")) == 1
+
+
+def test_metadata_only_search_skips_body(temp_tasks_dir, load_post_calls):
+    """Searches without a text query only read the frontmatter block"""
+    import taskmaster.cache as cache_module
+
+    manager = TaskManager(temp_tasks_dir)
+    manager.create_task("ho/task1.md", "Header", content="body " * 1000, metadata={"status": "open", "tags": ["x"]})
+    # Writes prime the shared cache with the full Post; start from a cold cache
+    cache_module.default_cache.clear()
+
+    searcher = TaskSearcher(temp_tasks_dir, persist_index=False)
+    assert [r['title'] for r in searcher.search(metadata_filters={"status": "open"})] == ["Header"]
+    assert searcher.search_by_tags(["x"])[0]['title'] == "Header"
+    assert searcher.get_all_tags() == {"x"}
+    assert ("task1.md", None) not in load_post_calls
+
+    assert searcher.search(query="body")[0]['score'] == 1000
+    assert ("task1.md", None) in load_post_calls
+
+
+def test_search_async_matches_search(temp_tasks_dir):
+    """search_async and threaded searches return the same results as search"""
+    import asyncio
+
+    manager = TaskManager(temp_tasks_dir)
+    for i in range(10):
+        manager.create_task(f"as/task{i}.md", f"Async {i}", content="word " * i, metadata={"status": "open" if i % 2 else "done"})
+
+    searcher = TaskSearcher(temp_tasks_dir)
+    threaded = TaskSearcher(temp_tasks_dir, max_workers=4)
+    for kwargs in ({"query": "word"}, {"metadata_filters": {"status": "open"}}, {"query": "async", "max_results": 3}):
+        assert asyncio.run(searcher.search_async(**kwargs)) == searcher.search(**kwargs)
+        assert threaded.search(**kwargs) == searcher.search(**kwargs)
+
+
+def test_search_query_is_literal_and_case_insensitive(temp_tasks_dir):
+    """Queries match literally (no regex syntax) regardless of case"""
+    manager = TaskManager(temp_tasks_dir)
+    manager.create_task("lit/task1.md", "C++ port", content="Port the C++ code. c++ everywhere.")
+    manager.create_task("lit/task2.md", "Other", content="cpp only")
+
+    searcher = TaskSearcher(temp_tasks_dir)
+    results = searcher.search(query="C++")
+    assert [r['title'] for r in results] == ["C++ port"]
+    assert results[0]['score'] == 12
+    assert results[0]['snippet'].startswith("Port the C++")
+
+
+def test_search_returns_top_scores_not_first_matches(temp_tasks_dir):
+    """max_results keeps the best matches even when they are found last"""
+    manager = TaskManager(temp_tasks_dir)
+    for i in range(5):
+        manager.create_task(f"top/task{i}.md", f"Task {i}", content="hit " * (i + 1))
+
+    searcher = TaskSearcher(temp_tasks_dir)
+    results = searcher.search(query="hit", max_results=2)
+    assert [r['score'] for r in results] == [5, 4]
+
+
+def test_search_path_pattern(temp_tasks_dir):
+    """path_pattern selects a directory, a subtree or a single task"""
+    manager = TaskManager(temp_tasks_dir)
+    manager.create_task("pp/top.md", "Top", metadata={"status": "open"})
+    manager.create_task("pp/sub/deep.md", "Deep", metadata={"status": "open"})
+    manager.create_task("other/top.md", "Elsewhere", metadata={"status": "open"})
+
+    searcher = TaskSearcher(temp_tasks_dir)
+    titles = lambda **kw: sorted(r['title'] for r in searcher.search(**kw))
+    assert titles(path_pattern="pp") == ["Top"]
+    assert titles(path_pattern="pp/**") == ["Deep", "Top"]
+    assert titles(path_pattern="*/top.md") == ["Elsewhere", "Top"]
+    assert titles(path_pattern="pp/**", metadata_filters={"status": "open"}) == ["Deep", "Top"]
+    assert titles(path_pattern="missing/**") == []
+
+
+def test_get_all_tags_from_index(temp_tasks_dir, monkeypatch):
+    """Tag listing reuses the metadata index instead of re-reading unchanged files"""
+    import taskmaster.index as index_module
+
+    manager = TaskManager(temp_tasks_dir)
+    manager.create_task("task1.md", "One", metadata={"tags": ["Alpha", "beta"]}, project="ti")
+    manager.create_task("task1.md", "Two", metadata={"tags": "gamma"}, project="tiother")
+
+    searcher = TaskSearcher(temp_tasks_dir)
+    assert searcher.get_all_tags() == {"alpha", "beta", "gamma"}
+
+    monkeypatch.setattr(index_module, "_load_post", None)
+    assert searcher.get_all_tags(project="ti") == {"alpha", "beta"}
+    assert searcher.get_all_tags(project="tiother") == {"gamma"}
+
+
+def test_get_all_tags_skips_empty_and_scalar_tags(temp_tasks_dir):
+    """An empty `tags:` or a non-list, non-string value contributes no tags"""
+    os.makedirs(os.path.join(temp_tasks_dir, "te"))
+    for name, tags in (("empty.md", ""), ("number.md", " 5"), ("list.md", " [real]")):
+        with open(os.path.join(temp_tasks_dir, "te", name), "w", encoding="utf-8") as f:
+            f.write(f"---\ntitle: T\ntags:{tags}\n---\n")
+
+    searcher = TaskSearcher(temp_tasks_dir)
+    assert searcher.get_all_tags() == {"real"}
+    assert searcher._collect_tags(searcher.base_path) == {"real"}
+
+
+def test_frontmatter_cache_shared_between_manager_and_searcher(temp_tasks_dir, monkeypatch):
+    """A task read by the manager is not parsed again by a searcher sharing its cache"""
+    import taskmaster.cache as cache_module
+    from taskmaster.cache import FrontmatterCache
+
+    cache = FrontmatterCache()
+    manager = TaskManager(temp_tasks_dir, cache=cache)
+    searcher = TaskSearcher(temp_tasks_dir, cache=cache)
+    manager.create_task("sc/task1.md", "Shared", content="needle")
+    assert manager.read_task("sc/task1.md")['content'] == "needle"
+
+    monkeypatch.setattr(cache_module, "_load_post", None)
+    assert searcher.search(query="needle")[0]['title'] == "Shared"
+
+
+def test_text_search_skips_files_via_bloom_filter(temp_tasks_dir, load_post_calls):
+    """Persisted trigram Bloom filters keep text searches from reading non-matching files"""
+    from taskmaster.cache import FrontmatterCache
+
+    manager = TaskManager(temp_tasks_dir)
+    manager.create_task("bf/task1.md", "Haystack", content="nothing to see")
+    manager.create_task("bf/task2.md", "Other", content="a needle here")
+    assert [r['title'] for r in TaskSearcher(temp_tasks_dir).search(query="needle")] == ["Other"]
+
+    load_post_calls.clear()
+    searcher = TaskSearcher(temp_tasks_dir, cache=FrontmatterCache())
+    assert [r['title'] for r in searcher.search(query="NEEDLE")] == ["Other"]
+    assert [name for name, _ in load_post_calls] == ["task2.md"]
+
+    manager.update_task("bf/task1.md", content="now a needle too")
+    assert len(searcher.search(query="needle")) == 2
+
+
+def test_search_large_file_scanned_via_mmap(temp_tasks_dir):
+    """Large task bodies are counted by the mmap path with the same scores"""
+    manager = TaskManager(temp_tasks_dir)
+    body = ("filler text " * 2000) + "Needle in the middle " + ("more filler " * 2000) + "needle"
+    manager.create_task("big/task1.md", "Big needle", content=body, metadata={"status": "open"})
+
+    searcher = TaskSearcher(temp_tasks_dir)
+    results = searcher.search(query="needle")
+    assert results[0]['score'] == 12
+    assert "Needle in the middle" in results[0]['snippet']
+    assert "status" not in results[0]['snippet']
+    assert searcher.search(query="needle", include_content=True)[0]['score'] == 12
+
+
+def test_metadata_search_served_from_index(temp_tasks_dir, monkeypatch, load_post_calls):
+    """A fresh process answers metadata-only searches from the persisted index alone"""
+    from datetime import date
+    import taskmaster.index as index_module
+    from taskmaster.cache import FrontmatterCache
+
+    manager = TaskManager(temp_tasks_dir)
+    manager.create_task("si/task1.md", "Indexed", metadata={"status": "open", "tags": ["x"]})
+    manager.create_task("si/task2.md", "Dated", metadata={"status": "open", "due": date(2024, 1, 2)})
+    TaskSearcher(temp_tasks_dir).search(metadata_filters={"status": "open"})
+
+    load_post_calls.clear()
+    monkeypatch.setattr(index_module, "_load_post", None)
+
+    searcher = TaskSearcher(temp_tasks_dir, cache=FrontmatterCache())
+    results = searcher.search(metadata_filters={"status": "open"})
+    assert {r['title'] for r in results} == {"Indexed", "Dated"}
+    assert searcher.search_by_tags(["x"])[0]['metadata']['status'] == "open"
+    # Only the task whose frontmatter is not JSON-native had to be parsed
+    assert [name for name, _ in load_post_calls] == ["task2.md"]
+    assert next(r for r in results if r['title'] == "Dated")['metadata']['due'] == date(2024, 1, 2)
+
+
+def test_header_only_load_matches_full_parse(temp_tasks_dir):
+    """The direct YAML header path yields the same metadata as frontmatter.load"""
+    from taskmaster.cache import _load_post
+
+    manager = TaskManager(temp_tasks_dir)
+    manager.create_task("hd/task1.md", "Header", content="Body\n---\nmore",
+                        metadata={"status": "open", "tags": ["a", "b"], "nested": {"k": 1}})
+    md_file = Path(temp_tasks_dir) / "hd" / "task1.md"
+
+    header = _load_post(md_file, 0)
+    assert header.metadata == _load_post(md_file).metadata
+    assert header.content == ""
+
+
+def test_mmap_scan_counts_across_chunks(temp_tasks_dir, monkeypatch):
+    """Matches straddling scan chunk boundaries are counted once"""
+    import taskmaster.search as search_module
+
+    monkeypatch.setattr(search_module, "_SCAN_CHUNK", 5)
+    path = Path(temp_tasks_dir) / "chunk.md"
+    path.write_text("---\ntitle: x\n---\n" + "xxNeedLEyy" * 7 + "aaaa", encoding="utf-8")
+
+    assert search_module._scan_mapped(path, "needle")[0] == 7
+    assert search_module._scan_mapped(path, "aa")[0] == 2
+    assert search_module._scan_mapped(path, "zz") == (0, None)
+
+
+def test_index_postings_follow_edits_and_deletes(temp_tasks_dir):
+    """Posting lists are patched in place as tasks change or disappear"""
+    manager = TaskManager(temp_tasks_dir)
+    manager.create_task("ip/task1.md", "One", metadata={"tags": ["a", "b"]})
+    manager.create_task("ip/task2.md", "Two", metadata={"tags": ["b"]})
+
+    searcher = TaskSearcher(temp_tasks_dir)
+    assert len(searcher.search_by_tags(["b"])) == 2
+
+    manager.update_task("ip/task1.md", metadata={"tags": ["c"]})
+    assert [r['title'] for r in searcher.search_by_tags(["b"])] == ["Two"]
+    assert searcher.get_all_tags() == {"b", "c"}
+
+    manager.delete_task("ip/task2.md")
+    assert searcher.search_by_tags(["b"]) == []
+    assert searcher.get_all_tags() == {"c"}
+    assert [r['title'] for r in searcher.search_by_tags(["c", "a"], match_all=True)] == []
+
+
+def test_resolve_path_memoized_per_base_path(temp_tasks_dir, tmp_path):
+    """Memoized path resolution still honours each manager's base path and validation"""
+    first = TaskManager(temp_tasks_dir)
+    second = TaskManager(tmp_path)
+
+    full, rel = first._resolve_path(None, "proj/task.md")
+    assert rel == "proj/task.md"
+    assert full == Path(temp_tasks_dir) / "proj" / "task.md"
+
+    full, rel = second._resolve_path("proj", "proj/task.md")
+    assert rel == "proj/task.md"
+    assert full == Path(tmp_path) / "proj" / "task.md"
+
+    # Errors are raised on every call, not just the first
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            first._resolve_path("proj", "../escape.md")
+
+
+def test_update_task_reuses_cached_parse(temp_tasks_dir, monkeypatch, load_post_calls):
+    """Repeated updates start from the cached Post instead of re-parsing the file"""
+    import taskmaster.cache as cache_module
+
+    manager = TaskManager(temp_tasks_dir)
+    created = manager.create_task("upd/task.md", "Task", content="Body", metadata={"tags": ["a"]})
+    assert created['metadata']['created'] == created['metadata']['updated']
+
+    load_post_calls.clear()
+    manager.update_task("upd/task.md", metadata={"status": "open"})
+    manager.update_task("upd/task.md", add_tags=["b"])
+    assert load_post_calls == []
+
+    monkeypatch.undo()
+    task = TaskManager(temp_tasks_dir, cache=cache_module.FrontmatterCache()).read_task("upd/task.md")
+    assert task['metadata']['status'] == "open"
+    assert task['metadata']['tags'] == ["a", "b"]
+    assert task['content'] == "Body"
+    assert not [p for p in os.listdir(Path(temp_tasks_dir) / "upd") if p.endswith(".tmp")]
+
+
+def test_cache_keeps_lowercased_body(temp_tasks_dir):
+    """The lowercase body is computed once per parse and refreshed after an edit"""
+    from taskmaster.cache import FrontmatterCache
+
+    cache = FrontmatterCache()
+    manager = TaskManager(temp_tasks_dir, cache=cache)
+    manager.create_task("low/task.md", "Task", content="Hello WORLD")
+    md_file = Path(temp_tasks_dir) / "low" / "task.md"
+
+    post, lowered = cache.get_lowered(md_file)
+    assert lowered == "hello world"
+    again, lowered_again = cache.get_lowered(md_file)
+    assert again is post and lowered_again is lowered
+
+    manager.update_task("low/task.md", content="Goodbye WORLD!")
+    assert cache.get_lowered(md_file)[1] == "goodbye world!"
+
+    searcher = TaskSearcher(temp_tasks_dir, persist_index=False, cache=cache)
+    assert searcher.search(query="world")[0]['snippet'] == "Goodbye WORLD!"
+
+
+def test_load_post_formats(temp_tasks_dir):
+    """YAML, JSON and frontmatter-less files all parse through the shared handler path"""
+    from taskmaster.cache import _load_post
+
+    base = Path(temp_tasks_dir)
+    (base / "yaml.md").write_text("---\ntitle: Y\n---\nBody\n\n---\nafter rule\n", encoding="utf-8")
+    (base / "json.md").write_text('{\n"title": "J"\n}\nBody\n', encoding="utf-8")
+    (base / "plain.md").write_text("Intro\n\n---\n\nafter rule\n", encoding="utf-8")
+
+    post = _load_post(base / "yaml.md")
+    assert post['title'] == "Y" and "after rule" in post.content
+    assert _load_post(base / "json.md")['title'] == "J"
+    plain = _load_post(base / "plain.md")
+    assert plain.metadata == {} and plain.content.startswith("Intro")
+
+
+def test_index_keeps_raw_metadata_only_when_round_trippable():
+    """Metadata the sidecar cannot reproduce exactly is left to be parsed from the file"""
+    from taskmaster.index import _json_native
+
+    assert _json_native({"title": "T", "tags": ["a"], "points": 3, "ratio": 0.5, "done": False})
+    assert not _json_native({"ratio": float("nan")})
+    assert not _json_native({"big": 2**70})
+    assert not _json_native({"tags": ("a", "b")})
+
+
+def test_delete_and_move_prune_empty_dirs(temp_tasks_dir):
+    """Emptied directories are removed up to, but never including, the base path"""
+    manager = TaskManager(temp_tasks_dir)
+    base = Path(temp_tasks_dir)
+    manager.create_task("proj/a/b/task.md", "Deep")
+    manager.create_task("proj/keep.md", "Keep")
+    manager.create_task("solo/x/task.md", "Solo")
+
+    assert manager.delete_task("proj/a/b/task.md")
+    assert not (base / "proj" / "a").exists()
+    assert (base / "proj" / "keep.md").exists()
+
+    assert manager.move_task("solo/x/task.md", "proj/task.md")
+    assert not (base / "solo").exists()
+    assert base.is_dir()
+
+
+def test_mmap_snippet_keeps_multibyte_edges(temp_tasks_dir):
+    """Mapped-file snippets count context in characters and never split a UTF-8 character"""
+    import taskmaster.search as search_module
+
+    path = Path(temp_tasks_dir) / "utf8.md"
+    path.write_text("---\ntitle: x\n---\n" + "é" * 20 + "needle" + "ü" * 20, encoding="utf-8")
+
+    # Context is counted in characters, as in the decoded-content path
+    count, snippet = search_module._scan_mapped(path, "needle", context_chars=5)
+    assert count == 1
+    assert snippet == "...éééééneedleüüüüü..."
+    searcher = TaskSearcher(temp_tasks_dir)
+    content = searcher.cache.get(path).content
+    assert snippet == searcher._extract_snippet(content, content.find("needle"), 6, context_chars=5)
+
+    # A window reaching the body's edges gets no ellipsis
+    count, snippet = search_module._scan_mapped(path, "needle", context_chars=20)
+    assert snippet == "é" * 20 + "needle" + "ü" * 20
+
+
+def test_cache_counts_hits_and_misses(temp_tasks_dir):
+    """Repeated listings over an unchanged tree are served from the cache"""
+    from taskmaster.cache import FrontmatterCache
+
+    cache = FrontmatterCache()
+    manager = TaskManager(temp_tasks_dir, cache=cache)
+    for i in range(3):
+        manager.create_task(f"hm/task{i}.md", f"Task {i}")
+    cache.clear()
+
+    manager.list_tasks()
+    assert (cache.hits, cache.misses) == (0, 3)
+    manager.list_tasks()
+    manager.get_structure()
+    assert (cache.hits, cache.misses) == (6, 3)
+    assert manager.read_task("hm/missing.md") is None
+    assert manager.update_task("hm/task0.md/nested.md", title="x") is None
+
+
+def test_list_tasks_threaded_matches_sequential(temp_tasks_dir):
+    """Listing on a thread pool returns the same tasks in the same order"""
+    manager = TaskManager(temp_tasks_dir)
+    for i in range(12):
+        manager.create_task(f"pool/sub{i % 3}/task{i}.md", f"Task {i}", content=f"Body {i}")
+    (Path(temp_tasks_dir) / "pool" / "broken.md").write_text("---\n: [\n---\n", encoding="utf-8")
+
+    threaded = TaskManager(temp_tasks_dir, max_workers=4)
+    assert threaded.list_tasks("pool") == manager.list_tasks("pool")
+    assert threaded.list_tasks("pool", include_content=True) == manager.list_tasks("pool", include_content=True)
+    assert len(threaded.list_tasks("pool")) == 12
+
+
+def test_list_tasks_fields(temp_tasks_dir, monkeypatch):
+    """`fields` trims each task dict, and a path-only listing never opens the files"""
+    import taskmaster.cache as cache_module
+
+    manager = TaskManager(temp_tasks_dir)
+    manager.create_task("fl/a.md", "A", content="Body", metadata={"status": "open"})
+    manager.create_task("fl/sub/b.md", "B")
+
+    titles = manager.list_tasks("fl", fields=["title"])
+    assert sorted(t['title'] for t in titles) == ["A", "B"]
+    assert all(set(t) == {"title"} for t in titles)
+
+    with_content = manager.list_tasks("fl", include_content=True, fields=["path", "content"])
+    assert {t['path']: t['content'] for t in with_content}["fl/a.md"] == "Body"
+
+    monkeypatch.setattr(cache_module, "_load_post", lambda *a: pytest.fail("file was read"))
+    manager.cache.clear()
+    paths = manager.list_tasks("fl", fields={"path"})
+    assert sorted(t['path'] for t in paths) == ["fl/a.md", "fl/sub/b.md"]
+
+
+def test_move_task_never_overwrites(temp_tasks_dir, monkeypatch):
+    """Moves refuse existing destinations and missing sources, with or without hard links"""
+    import taskmaster.task_manager as tm_module
+
+    manager = TaskManager(temp_tasks_dir)
+    manager.create_task("mv/a.md", "A")
+    manager.create_task("mv/b.md", "B")
+
+    assert manager.move_task("mv/a.md", "mv/b.md") is False
+    assert manager.read_task("mv/a.md")['title'] == "A"
+    assert manager.read_task("mv/b.md")['title'] == "B"
+    assert manager.move_task("mv/missing.md", "mv/c.md") is False
+
+    def no_links(src, dst):
+        raise PermissionError("hard links not supported")
+
+    monkeypatch.setattr(tm_module.os, "link", no_links)
+    assert manager.move_task("mv/a.md", "mv/b.md") is False
+    assert manager.move_task("mv/a.md", "mv/new/a.md") is True
+    assert manager.read_task("mv/new/a.md")['title'] == "A"
+    assert manager.read_task("mv/a.md") is None
+
+
+def test_cache_follows_moves_and_deletes(temp_tasks_dir):
+    """Moved tasks keep their cached parse; deleted tasks are dropped from the cache"""
+    from taskmaster.cache import FrontmatterCache
+
+    cache = FrontmatterCache()
+    manager = TaskManager(temp_tasks_dir, cache=cache)
+    manager.create_task("cm/a.md", "A")
+    manager.create_task("cm/b.md", "B")
+
+    assert manager.move_task("cm/a.md", "cm/moved/a.md")
+    misses = cache.misses
+    assert manager.read_task("cm/moved/a.md")['title'] == "A"
+    assert cache.misses == misses
+
+    assert manager.delete_task("cm/b.md")
+    assert str(Path(temp_tasks_dir).resolve() / "cm" / "b.md") not in cache._entries
+    assert manager.delete_task("cm/b.md") is False
+
+
+def test_create_tasks_validates_before_writing(temp_tasks_dir):
+    """A bulk create with one invalid path writes nothing"""
+    manager = TaskManager(temp_tasks_dir)
+
+    with pytest.raises(ValueError):
+        manager.create_tasks([
+            {"path": "bulk/ok.md", "title": "OK"},
+            {"path": "../escape.md", "title": "Bad", "project": "bulk"},
+        ])
+    assert manager.list_tasks() == []
+
+    created = manager.create_tasks([
+        {"path": "ok.md", "title": "OK", "project": "bulk", "metadata": {"status": "open"}},
+        {"path": "bulk/sub/two.md", "title": "Two"},
+    ])
+    assert [c['path'] for c in created] == ["bulk/ok.md", "bulk/sub/two.md"]
+    assert manager.read_task("bulk/ok.md")['metadata']['status'] == "open"
+
+
+def test_searchers_share_index(temp_tasks_dir, monkeypatch):
+    """A second searcher over the same tree reuses the loaded index"""
+    import taskmaster.index as index_module
+
+    manager = TaskManager(temp_tasks_dir)
+    manager.create_task("sh/task1.md", "One", metadata={"status": "open"})
+    first = TaskSearcher(temp_tasks_dir)
+    assert len(first.search(metadata_filters={"status": "open"})) == 1
+
+    monkeypatch.setattr(index_module.TaskIndex, "load", lambda self: pytest.fail("sidecar re-read"))
+    second = TaskSearcher(temp_tasks_dir)
+    assert second.index is first.index
+    assert TaskSearcher(temp_tasks_dir, persist_index=False).index is not first.index
+
+    manager.update_task("sh/task1.md", metadata={"status": "done"})
+    assert len(second.search(metadata_filters={"status": "done"})) == 1
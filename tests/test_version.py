@@ -1,12 +1,16 @@
 import importlib
 import os
-import shutil
+import sys
 from pathlib import Path
 
 import pytest
 
 import taskmaster
 
+# These tests reload the package and rewrite taskmaster/_version.py, which is shared by
+# every pytest-xdist worker; keep them on one worker
+pytestmark = pytest.mark.xdist_group("version")
+
 
 def reload_pkg():
     importlib.invalidate_caches()
@@ -15,29 +19,35 @@ def reload_pkg():
 
 
 def test_env_var_overrides(tmp_path, monkeypatch):
+    # The reload re-runs version discovery at import time; monkeypatch puts the original
+    # __version__ back afterwards, so no second reload is needed to reset it
+    monkeypatch.setattr(taskmaster, "__version__", taskmaster.__version__)
     monkeypatch.setenv("TASKMASTER_VERSION", "1.2.3-env")
     v = reload_pkg()
     assert v == "1.2.3-env"
-    monkeypatch.delenv("TASKMASTER_VERSION")
-    reload_pkg()
 
 
 def test_scm_written_version_used(tmp_path, monkeypatch):
     # Simulate setuptools_scm write_to file by creating taskmaster/_version.py
+    monkeypatch.delenv("TASKMASTER_VERSION", raising=False)
     ver_file = Path(taskmaster.__file__).parent / "_version.py"
-    backup = None
-    if ver_file.exists():
-        backup = ver_file.read_text()
+    # Move any real file aside and put it back with os.replace: its bytes (and mtime)
+    # come back exactly as they were
+    backup = ver_file.with_suffix(".py.bak")
+    had_file = ver_file.exists()
+    if had_file:
+        os.replace(ver_file, backup)
     try:
-        ver_file.write_text('version = "9.9.9-test"\n')
-        v = reload_pkg()
-        assert v == "9.9.9-test"
+        ver_file.write_bytes(b'version = "9.9.9-test"\n')
+        importlib.invalidate_caches()
+        assert taskmaster._resolve_version() == "9.9.9-test"
     finally:
-        if backup is not None:
-            ver_file.write_text(backup)
+        if had_file:
+            os.replace(backup, ver_file)
         else:
             try:
                 ver_file.unlink()
             except FileNotFoundError:
                 pass
-        reload_pkg()
+        # Don't leave the test's module behind for later `import taskmaster._version`
+        sys.modules.pop("taskmaster._version", None)